@@ -1,14 +1,6 @@
 #!/usr/bin/env python3
+import io
 import os
-try:
-    import cairosvg
-    import PIL
-    from PIL import Image
-except ImportError:
-    print("Required packages missing. Installing...")
-    os.system("pip install cairosvg pillow")
-    import cairosvg
-    from PIL import Image
 
 # Define paths
 svg_path = "dot2archimate/web/static/img/favicon.svg"
@@ -17,23 +9,46 @@ png_path_16 = "dot2archimate/web/static/img/favicon-16.png"
 ico_path = "dot2archimate/web/static/img/favicon.ico"
 favicon_path = "dot2archimate/web/static/favicon.ico"
 
-# Convert SVG to PNG (32x32)
-print(f"Converting {svg_path} to PNG (32x32)...")
-cairosvg.svg2png(url=svg_path, write_to=png_path_32, output_width=32, output_height=32)
 
-# Convert SVG to PNG (16x16)
-print(f"Converting {svg_path} to PNG (16x16)...")
-cairosvg.svg2png(url=svg_path, write_to=png_path_16, output_width=16, output_height=16)
+def load_dependencies():
+    """Import cairosvg and Pillow only when the favicon is actually generated."""
+    try:
+        import cairosvg
+        from PIL import Image
+    except ImportError:
+        print("Required packages missing. Installing...")
+        os.system("pip install cairosvg pillow")
+        import cairosvg
+        from PIL import Image
+    return cairosvg, Image
 
-# Convert PNG to ICO (using both sizes)
-print(f"Converting PNG files to ICO...")
-img_32 = Image.open(png_path_32)
-img_16 = Image.open(png_path_16)
-img_32.save(ico_path, format='ICO', sizes=[(16, 16), (32, 32)])
 
-# Copy to favicon.ico in static directory
-import shutil
-print(f"Copying {ico_path} to {favicon_path}...")
-shutil.copy(ico_path, favicon_path)
+def main():
+    cairosvg, Image = load_dependencies()
 
-print("Favicon generation complete!") 
\ No newline at end of file
+    # Rasterize the SVG once; both icon sizes are resampled from this image
+    print(f"Converting {svg_path} to PNG...")
+    png_bytes = cairosvg.svg2png(url=svg_path, output_width=64, output_height=64)
+    base = Image.open(io.BytesIO(png_bytes))
+    img_32 = base.resize((32, 32), Image.LANCZOS)
+    img_16 = base.resize((16, 16), Image.LANCZOS)
+
+    # The PNG icons are referenced directly by the web templates
+    print(f"Writing {png_path_32} and {png_path_16}...")
+    img_32.save(png_path_32, format='PNG')
+    img_16.save(png_path_16, format='PNG')
+
+    # Build the ICO (using both sizes) in memory and write it to both locations
+    print(f"Writing {ico_path} and {favicon_path}...")
+    ico_buffer = io.BytesIO()
+    img_32.save(ico_buffer, format='ICO', sizes=[(16, 16), (32, 32)], append_images=[img_16])
+    ico_bytes = ico_buffer.getvalue()
+    for path in (ico_path, favicon_path):
+        with open(path, 'wb') as f:
+            f.write(ico_bytes)
+
+    print("Favicon generation complete!")
+
+
+if __name__ == '__main__':
+    main()
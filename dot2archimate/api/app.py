@@ -1,33 +1,69 @@
 from fastapi import FastAPI, UploadFile, File, HTTPException, Form
-from fastapi.responses import PlainTextResponse
-import os
-import sys
+from fastapi.responses import StreamingResponse
+import asyncio
 import logging
+import tempfile
+from contextlib import asynccontextmanager
+from functools import partial
 
-# Add parent directory to path to allow imports
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from dot2archimate import logging_config
+from dot2archimate.core.factory import get_pipeline
 
-from dot2archimate.core.parser import DotParser
-from dot2archimate.core.mapper import ArchimateMapper
-from dot2archimate.core.generator import ArchimateXMLGenerator
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
+# Small graph converted at startup so the first request doesn't pay for cold caches
+WARM_UP_DOT = 'digraph G { a [type="application"]; b [type="business"]; a -> b; }'
+
+def _warm_up():
+    """Run the full conversion pipeline once on a tiny graph."""
+    _convert_to_spool(parser.parse_string, WARM_UP_DOT).close()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Configure logging and warm up the pipeline before serving requests."""
+    logging_config.setup()
+    try:
+        await asyncio.to_thread(_warm_up)
+    except Exception as e:
+        logger.warning("Pipeline warm-up failed: %s", e)
+    yield
+
 app = FastAPI(
     title="DOT to ArchiMate Converter",
     description="Convert Graphviz DOT files to ArchiMate XML format",
-    version="0.1.0"
+    version="0.1.0",
+    lifespan=lifespan
 )
 
 # Initialize components
-parser = DotParser()
-mapper = ArchimateMapper("config.yaml")
-generator = ArchimateXMLGenerator()
+parser, mapper, generator = get_pipeline("config.yaml")
+
+# Uploads and responses are read from their spooled files in chunks of this size
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+# Generated XML is kept in memory up to this size and spills to disk beyond it
+RESPONSE_SPOOL_SIZE = 8 * 1024 * 1024
+
+def _convert_to_spool(parse, source) -> tempfile.SpooledTemporaryFile:
+    """Parse, map and write a DOT source to a spooled file, rewound for reading.
+
+    The whole document is generated before the response starts, so a
+    failure anywhere in the conversion still gets an error status rather
+    than a truncated body sent with 200.
+    """
+    spool = tempfile.SpooledTemporaryFile(max_size=RESPONSE_SPOOL_SIZE)
+    try:
+        generator.convert(mapper, parse(source), spool)
+    except BaseException:
+        spool.close()
+        raise
+    spool.seek(0)
+    return spool
+
+def _iter_spool(spool):
+    """Yield a spooled document in chunks, closing it once it has been sent."""
+    with spool:
+        yield from iter(partial(spool.read, UPLOAD_CHUNK_SIZE), b'')
 
 @app.get("/")
 async def root():
@@ -40,37 +76,36 @@ async def root():
         ]
     }
 
-@app.post("/convert/file", response_class=PlainTextResponse)
+@app.post("/convert/file", response_class=StreamingResponse)
 async def convert_file(file: UploadFile = File(...)):
     """Convert uploaded DOT file to ArchiMate XML."""
     try:
-        logger.info(f"Processing file upload: {file.filename}")
-        content = await file.read()
-        dot_string = content.decode('utf-8')
+        logger.info("Processing file upload: %s", file.filename)
+        # Read the spooled upload in chunks, decoding as we go, instead of
+        # loading the whole body as bytes first
+        chunks = iter(partial(file.file.read, UPLOAD_CHUNK_SIZE), b'')
         
-        # Process the conversion
-        graph_data = parser.parse_string(dot_string)
-        archimate_data = mapper.map_to_archimate(graph_data)
-        xml_output = generator.generate_xml(archimate_data)
+        # Process the conversion in a worker thread to keep the event loop free
+        spool = await asyncio.to_thread(_convert_to_spool, parser.parse_stream, chunks)
         
-        logger.info(f"Successfully converted file: {file.filename}")
-        return xml_output
+        logger.info("Successfully converted file: %s", file.filename)
+        # Stream the XML from the spool instead of holding it as one string
+        return StreamingResponse(_iter_spool(spool), media_type='application/xml')
     except Exception as e:
-        logger.error(f"Error converting file: {str(e)}")
+        logger.error("Error converting file: %s", e)
         raise HTTPException(status_code=400, detail=str(e))
 
-@app.post("/convert/text", response_class=PlainTextResponse)
+@app.post("/convert/text", response_class=StreamingResponse)
 async def convert_text(dot_content: str = Form(...)):
     """Convert DOT text content to ArchiMate XML."""
     try:
         logger.info("Processing DOT text content")
-        # Process the conversion
-        graph_data = parser.parse_string(dot_content)
-        archimate_data = mapper.map_to_archimate(graph_data)
-        xml_output = generator.generate_xml(archimate_data)
+        # Process the conversion in a worker thread to keep the event loop free
+        spool = await asyncio.to_thread(_convert_to_spool, parser.parse_string, dot_content)
         
         logger.info("Successfully converted DOT text content")
-        return xml_output
+        # Stream the XML from the spool instead of holding it as one string
+        return StreamingResponse(_iter_spool(spool), media_type='application/xml')
     except Exception as e:
-        logger.error(f"Error converting text content: {str(e)}")
+        logger.error("Error converting text content: %s", e)
         raise HTTPException(status_code=400, detail=str(e)) 
\ No newline at end of file
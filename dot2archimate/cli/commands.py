@@ -2,96 +2,184 @@ import click
 import os
 import sys
 import logging
+import queue
 import subprocess
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
-logger = logging.getLogger(__name__)
+from dot2archimate import logging_config
+from dot2archimate.core.converter import Converter
+from dot2archimate.core.factory import get_pipeline
 
-from dot2archimate.core.parser import DotParser
-from dot2archimate.core.mapper import ArchimateMapper
-from dot2archimate.core.generator import ArchimateXMLGenerator
+logger = logging.getLogger(__name__)
 
 @click.group()
 def cli():
     """DOT to ArchiMate converter CLI"""
-    pass
+    # Configured when the CLI runs rather than on import, so importing this
+    # module leaves the host application's logging alone
+    logging_config.setup()
 
 @cli.command()
 @click.option('--input', '-i', required=True, help='Input DOT file path')
-@click.option('--output', '-o', required=True, help='Output ArchiMate XML file path')
+@click.option('--output', '-o', required=True, help='Output ArchiMate XML file path, or - to stream to stdout')
 @click.option('--config', '-c', default='config.yaml', help='Configuration file path')
-def convert(input, output, config):
+@click.option('--no-cache', is_flag=True, help='Always convert, ignoring previously cached output')
+@click.option('--pretty', is_flag=True, help='Indent the XML output')
+def convert(input, output, config, no_cache, pretty):
     """Convert a DOT file to ArchiMate XML"""
+    # Status messages go to stderr when the XML itself is written to stdout
+    to_stdout = output == '-'
     try:
-        logger.info(f"Converting {input} to {output}")
-        
-        # Initialize components
-        parser = DotParser()
-        mapper = ArchimateMapper(config)
-        generator = ArchimateXMLGenerator()
-
-        # Process the conversion
-        graph_data = parser.parse_file(input)
-        archimate_data = mapper.map_to_archimate(graph_data)
-        xml_output = generator.generate_xml(archimate_data)
-
-        # Write output
-        with open(output, 'w', encoding='utf-8') as f:
-            f.write(xml_output)
-
-        logger.info(f"Successfully converted {input} to {output}")
-        click.echo(f"Successfully converted {input} to {output}")
+        if to_stdout:
+            logger.info("Converting %s to %s", input, output)
+
+            # Initialize components
+            parser, mapper, generator = get_pipeline(config)
+
+            graph_data = parser.parse_file(input)
+            if pretty:
+                # Indentation needs the complete document
+                archimate_data = mapper.map_to_archimate(graph_data)
+                sys.stdout.buffer.write(generator.generate_xml_bytes(archimate_data, pretty_print=True))
+            else:
+                # Stream each element as it is mapped instead of building
+                # the model or the document first
+                generator.convert(mapper, graph_data, sys.stdout.buffer)
+            sys.stdout.buffer.flush()
+            logger.info("Successfully converted %s to %s", input, output)
+        else:
+            # Unchanged inputs are served from the on-disk cache
+            Converter(config, use_cache=not no_cache, pretty_print=pretty).convert(input, output)
+
+        click.echo(f"Successfully converted {input} to {output}", err=to_stdout)
     except Exception as e:
-        logger.error(f"Error: {str(e)}")
+        logger.error("Error: %s", e)
         click.echo(f"Error: {str(e)}", err=True)
         sys.exit(1)
 
+# Number of files buffered between the stages of the serial pipeline
+PIPELINE_DEPTH = 4
+
+def _convert_one(path_pair, config, pretty_print=False):
+    """Convert a single (input_path, output_path) pair; runs in a worker process."""
+    input_path, output_path = path_pair
+
+    # Initialize components (cached per worker process)
+    parser, mapper, generator = get_pipeline(config)
+
+    # Process the conversion
+    graph_data = parser.parse_file(input_path)
+    archimate_data = mapper.map_to_archimate(graph_data)
+    _write_xml(generator, archimate_data, output_path, pretty_print)
+
+    return os.path.basename(input_path)
+
+def _write_xml(generator, archimate_data, output_path, pretty_print=False):
+    """Generate the XML and write the already-encoded output without a text-mode layer."""
+    xml_output = generator.generate_xml_bytes(archimate_data, pretty_print=pretty_print)
+    with open(output_path, 'wb') as f:
+        f.write(xml_output)
+
+def _is_dot_file_name(filename):
+    """Return True for visible files with a .dot extension."""
+    return filename.endswith('.dot') and not filename.startswith('.')
+
+def _parse_stage(pairs, parser, outbox):
+    """Read and parse each input, passing (path_pair, graph_data) downstream."""
+    try:
+        for pair in pairs:
+            outbox.put((pair, parser.parse_file(pair[0])))
+        outbox.put(None)
+    except Exception as e:
+        outbox.put(e)
+
+def _map_stage(mapper, inbox, outbox):
+    """Map parsed graphs, passing (path_pair, archimate_data) downstream.
+
+    An error or the None end-of-stream marker is forwarded and stops the stage.
+    """
+    while True:
+        item = inbox.get()
+        if item is None or isinstance(item, Exception):
+            outbox.put(item)
+            return
+        pair, graph_data = item
+        try:
+            outbox.put((pair, mapper.map_to_archimate(graph_data)))
+        except Exception as e:
+            outbox.put(e)
+            return
+
+def _pipeline(pairs, config, pretty_print=False, depth=PIPELINE_DEPTH):
+    """Convert files in three overlapping stages, yielding each converted file name.
+
+    Parsing and mapping run on background threads connected by bounded
+    queues, while the XML for earlier files is generated and written on the
+    calling thread.
+    """
+    parser, mapper, generator = get_pipeline(config)
+    parsed = queue.Queue(maxsize=depth)
+    mapped = queue.Queue(maxsize=depth)
+    threading.Thread(target=_parse_stage, args=(pairs, parser, parsed), daemon=True).start()
+    threading.Thread(target=_map_stage, args=(mapper, parsed, mapped), daemon=True).start()
+
+    while True:
+        item = mapped.get()
+        if item is None:
+            return
+        if isinstance(item, Exception):
+            raise item
+        (input_path, output_path), archimate_data = item
+        _write_xml(generator, archimate_data, output_path, pretty_print)
+        yield os.path.basename(input_path)
+
 @cli.command()
 @click.option('--input-dir', '-i', required=True, help='Input directory containing DOT files')
 @click.option('--output-dir', '-o', required=True, help='Output directory for ArchiMate XML files')
 @click.option('--config', '-c', default='config.yaml', help='Configuration file path')
-def batch_convert(input_dir, output_dir, config):
+@click.option('--jobs', '-j', type=click.IntRange(min=1), default=os.cpu_count() or 1, show_default=True,
+              help='Number of files to convert in parallel')
+@click.option('--pretty', is_flag=True, help='Indent the XML output')
+def batch_convert(input_dir, output_dir, config, jobs, pretty):
     """Convert multiple DOT files to ArchiMate XML"""
     try:
         # Create output directory if it doesn't exist
         os.makedirs(output_dir, exist_ok=True)
 
-        logger.info(f"Batch converting files from {input_dir} to {output_dir}")
-        
-        # Initialize components
-        parser = DotParser()
-        mapper = ArchimateMapper(config)
-        generator = ArchimateXMLGenerator()
+        logger.info("Batch converting files from %s to %s using %s job(s)", input_dir, output_dir, jobs)
 
-        # Process all .dot files in the input directory
-        converted_count = 0
-        for filename in os.listdir(input_dir):
-            if filename.endswith('.dot'):
-                input_path = os.path.join(input_dir, filename)
-                output_path = os.path.join(output_dir, filename.replace('.dot', '.xml'))
-
-                logger.info(f"Converting {filename}")
-                
-                # Process the conversion
-                graph_data = parser.parse_file(input_path)
-                archimate_data = mapper.map_to_archimate(graph_data)
-                xml_output = generator.generate_xml(archimate_data)
+        # Collect all .dot files in the input directory, skipping hidden files
+        # like glob does; the name checks run first as they need no syscall
+        with os.scandir(input_dir) as it:
+            entries = [entry for entry in it if _is_dot_file_name(entry.name) and entry.is_file()]
 
-                # Write output
-                with open(output_path, 'w', encoding='utf-8') as f:
-                    f.write(xml_output)
+        # Schedule the largest files first so workers finish at about the same time
+        entries.sort(key=lambda entry: entry.stat().st_size, reverse=True)
+        pairs = [
+            (entry.path, os.path.join(output_dir, Path(entry.name).stem + '.xml'))
+            for entry in entries
+        ]
 
+        converted_count = 0
+        if jobs == 1 or len(pairs) <= 1:
+            # Overlap parsing, mapping and writing of consecutive files
+            for filename in _pipeline(pairs, config, pretty):
                 converted_count += 1
                 click.echo(f"Converted {filename}")
+        else:
+            # Files are independent, so convert them in parallel across processes
+            with ProcessPoolExecutor(max_workers=min(jobs, len(pairs))) as executor:
+                for filename in executor.map(partial(_convert_one, config=config, pretty_print=pretty), pairs):
+                    converted_count += 1
+                    click.echo(f"Converted {filename}")
 
-        logger.info(f"Batch conversion completed: {converted_count} files converted")
+        logger.info("Batch conversion completed: %s files converted", converted_count)
         click.echo(f"Batch conversion completed: {converted_count} files converted")
     except Exception as e:
-        logger.error(f"Error: {str(e)}")
+        logger.error("Error: %s", e)
         click.echo(f"Error: {str(e)}", err=True)
         sys.exit(1)
 
@@ -110,7 +198,7 @@ def web(host, port, debug):
         click.echo("Error: Flask is not installed. Please install it with 'pip install flask'", err=True)
         sys.exit(1)
     except Exception as e:
-        logger.error(f"Error starting web interface: {str(e)}")
+        logger.error("Error starting web interface: %s", e)
         click.echo(f"Error starting web interface: {str(e)}", err=True)
         sys.exit(1)
 
@@ -128,7 +216,7 @@ def web(host, port, debug):
 @click.option('--hoster', help='Hosting provider (privacy section only)')
 def legal_config(show, create, section, company_name, street, zip_city, country, phone, email, copyright_year, hoster):
     """Manage legal settings for the web interface"""
-    from dot2archimate.cli.legal_config import load_config, create_default_config, save_config, show_config
+    from dot2archimate.cli.legal_config import load_config, create_default_config, save_config, show_config, apply_updates
     
     try:
         if show:
@@ -144,58 +232,29 @@ def legal_config(show, create, section, company_name, street, zip_city, country,
             return
         
         # If neither show nor create, treat as update
+        updates = {
+            'company_name': company_name,
+            'street': street,
+            'zip_city': zip_city,
+            'country': country,
+            'phone': phone,
+            'email': email,
+            'copyright_year': copyright_year,
+            'hoster': hoster
+        }
+        
+        # Check if any updates were provided
+        if not any(updates.values()):
+            click.echo("No updates provided. Use --help to see available options.")
+            return
+        
         config = load_config()
         
         # Initialize config if it doesn't exist
         if not config:
             config = create_default_config()
         
-        # Update impressum settings
-        if section == 'impressum' or section == 'all':
-            if 'impressum' not in config:
-                config['impressum'] = {}
-                
-            if company_name:
-                config['impressum']['company_name'] = company_name
-            if street:
-                config['impressum']['street'] = street
-            if zip_city:
-                config['impressum']['zip_city'] = zip_city
-            if country:
-                config['impressum']['country'] = country
-            if phone:
-                config['impressum']['phone'] = phone
-            if email:
-                config['impressum']['email'] = email
-            if copyright_year:
-                config['impressum']['copyright_year'] = copyright_year
-        
-        # Update privacy settings
-        if section == 'privacy' or section == 'all':
-            if 'privacy' not in config:
-                config['privacy'] = {}
-                
-            if company_name:
-                config['privacy']['company_name'] = company_name
-            if street:
-                config['privacy']['street'] = street
-            if zip_city:
-                config['privacy']['zip_city'] = zip_city
-            if country:
-                config['privacy']['country'] = country
-            if phone:
-                config['privacy']['phone'] = phone
-            if email:
-                config['privacy']['email'] = email
-            if copyright_year:
-                config['privacy']['copyright_year'] = copyright_year
-            if hoster:
-                config['privacy']['hoster'] = hoster
-        
-        # Check if any updates were provided
-        if not any([company_name, street, zip_city, country, phone, email, copyright_year, hoster]):
-            click.echo("No updates provided. Use --help to see available options.")
-            return
+        apply_updates(config, section, updates)
         
         # Save the updated configuration
         if save_config(config):
@@ -205,7 +264,7 @@ def legal_config(show, create, section, company_name, street, zip_city, country,
             click.echo("Failed to update legal configuration.")
             
     except Exception as e:
-        logger.error(f"Error managing legal configuration: {str(e)}")
+        logger.error("Error managing legal configuration: %s", e)
         click.echo(f"Error: {str(e)}", err=True)
         sys.exit(1)
 
@@ -1,14 +1,12 @@
 import argparse
+import copy
 import os
 import sys
-import yaml
 import logging
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+from dot2archimate.config import yaml_compat
+from dot2archimate import logging_config
+
 logger = logging.getLogger(__name__)
 
 def get_config_path():
@@ -31,7 +29,7 @@ def get_config_path():
     # Create the config directory if it doesn't exist
     if not os.path.exists(config_dir):
         os.makedirs(config_dir)
-        logger.info(f"Created config directory at {config_dir}")
+        logger.info("Created config directory at %s", config_dir)
     
     return config_path, template_path
 
@@ -42,16 +40,16 @@ def load_config():
     if os.path.exists(config_path):
         try:
             with open(config_path, 'r', encoding='utf-8') as file:
-                return yaml.safe_load(file)
+                return yaml_compat.load(file)
         except Exception as e:
-            logger.error(f"Error loading legal configuration: {str(e)}")
+            logger.error("Error loading legal configuration: %s", e)
             return {}
     else:
         if os.path.exists(template_path):
-            logger.warning(f"Config file not found at {config_path}")
-            logger.info(f"You can create it by copying the template: cp {template_path} {config_path}")
+            logger.warning("Config file not found at %s", config_path)
+            logger.info("You can create it by copying the template: cp %s %s", template_path, config_path)
         else:
-            logger.warning(f"Neither config file nor template found")
+            logger.warning("Neither config file nor template found")
         return {}
 
 def save_config(config):
@@ -59,14 +57,37 @@ def save_config(config):
     config_path, _ = get_config_path()
     
     try:
-        with open(config_path, 'w', encoding='utf-8') as file:
-            yaml.dump(config, file, default_flow_style=False, allow_unicode=True)
-        logger.info(f"Configuration saved to {config_path}")
+        with open(config_path, 'wb') as file:
+            yaml_compat.dump(config, file, encoding='utf-8')
+        logger.info("Configuration saved to %s", config_path)
         return True
     except Exception as e:
-        logger.error(f"Error saving configuration: {str(e)}")
+        logger.error("Error saving configuration: %s", e)
         return False
 
+# Placeholder legal configuration used when no template is available
+DEFAULT_LEGAL_CONFIG = {
+    'impressum': {
+        'company_name': 'Your Company Name',
+        'street': 'Your Street Address',
+        'zip_city': 'Your ZIP and City',
+        'country': 'Your Country',
+        'phone': 'Your Phone Number',
+        'email': 'your.email@example.com',
+        'copyright_year': '2025'
+    },
+    'privacy': {
+        'company_name': 'Your Company Name',
+        'street': 'Your Street Address',
+        'zip_city': 'Your ZIP and City',
+        'country': 'Your Country',
+        'phone': 'Your Phone Number',
+        'email': 'your.email@example.com',
+        'copyright_year': '2025',
+        'hoster': 'Your Hosting Provider'
+    }
+}
+
 def create_default_config():
     """Create a default legal configuration."""
     _, template_path = get_config_path()
@@ -75,36 +96,32 @@ def create_default_config():
     if os.path.exists(template_path):
         try:
             with open(template_path, 'r', encoding='utf-8') as file:
-                template_config = yaml.safe_load(file)
-                logger.info(f"Created configuration based on template: {template_path}")
+                template_config = yaml_compat.load(file)
+                logger.info("Created configuration based on template: %s", template_path)
                 return template_config
         except Exception as e:
-            logger.error(f"Error loading template: {str(e)}")
+            logger.error("Error loading template: %s", e)
             # Fall back to hardcoded default
     
     # Default hardcoded configuration
     logger.info("Creating hardcoded default configuration")
-    return {
-        'impressum': {
-            'company_name': 'Your Company Name',
-            'street': 'Your Street Address',
-            'zip_city': 'Your ZIP and City',
-            'country': 'Your Country',
-            'phone': 'Your Phone Number',
-            'email': 'your.email@example.com',
-            'copyright_year': '2025'
-        },
-        'privacy': {
-            'company_name': 'Your Company Name',
-            'street': 'Your Street Address',
-            'zip_city': 'Your ZIP and City',
-            'country': 'Your Country',
-            'phone': 'Your Phone Number',
-            'email': 'your.email@example.com',
-            'copyright_year': '2025',
-            'hoster': 'Your Hosting Provider'
-        }
-    }
+    return copy.deepcopy(DEFAULT_LEGAL_CONFIG)
+
+# Fields that can be updated per section of the legal configuration
+IMPRESSUM_FIELDS = ('company_name', 'street', 'zip_city', 'country', 'phone', 'email', 'copyright_year')
+PRIVACY_FIELDS = IMPRESSUM_FIELDS + ('hoster',)
+SECTION_FIELDS = (('impressum', IMPRESSUM_FIELDS), ('privacy', PRIVACY_FIELDS))
+
+def apply_updates(config, section, values):
+    """Copy the provided field values into the selected section(s) of config."""
+    for name, fields in SECTION_FIELDS:
+        if section == name or section == 'all':
+            section_config = config.setdefault(name, {})
+            for field in fields:
+                value = values.get(field)
+                if value:
+                    section_config[field] = value
+    return config
 
 def update_config(args):
     """Update the legal configuration."""
@@ -114,47 +131,7 @@ def update_config(args):
     if not config:
         config = create_default_config()
     
-    # Update impressum settings
-    if args.section == 'impressum' or args.section == 'all':
-        if not 'impressum' in config:
-            config['impressum'] = {}
-            
-        if args.company_name:
-            config['impressum']['company_name'] = args.company_name
-        if args.street:
-            config['impressum']['street'] = args.street
-        if args.zip_city:
-            config['impressum']['zip_city'] = args.zip_city
-        if args.country:
-            config['impressum']['country'] = args.country
-        if args.phone:
-            config['impressum']['phone'] = args.phone
-        if args.email:
-            config['impressum']['email'] = args.email
-        if args.copyright_year:
-            config['impressum']['copyright_year'] = args.copyright_year
-    
-    # Update privacy settings
-    if args.section == 'privacy' or args.section == 'all':
-        if not 'privacy' in config:
-            config['privacy'] = {}
-            
-        if args.company_name:
-            config['privacy']['company_name'] = args.company_name
-        if args.street:
-            config['privacy']['street'] = args.street
-        if args.zip_city:
-            config['privacy']['zip_city'] = args.zip_city
-        if args.country:
-            config['privacy']['country'] = args.country
-        if args.phone:
-            config['privacy']['phone'] = args.phone
-        if args.email:
-            config['privacy']['email'] = args.email
-        if args.copyright_year:
-            config['privacy']['copyright_year'] = args.copyright_year
-        if args.hoster:
-            config['privacy']['hoster'] = args.hoster
+    apply_updates(config, args.section, vars(args))
     
     # Save the updated configuration
     if save_config(config):
@@ -198,6 +175,7 @@ def show_config():
         print()
 
 def main():
+    logging_config.setup()
     parser = argparse.ArgumentParser(description='Manage legal settings for the DOT to ArchiMate Converter.')
     subparsers = parser.add_subparsers(dest='command', help='Command to execute')
     
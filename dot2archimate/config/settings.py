@@ -1,7 +1,59 @@
 import os
-import yaml
+from types import MappingProxyType
 from typing import Dict, Any
 
+from dot2archimate.config import yaml_compat
+
+def _freeze(value):
+    """Return a read-only copy of nested dicts and lists."""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+def _thaw(value):
+    """Return a mutable deep copy of a value produced by _freeze."""
+    if isinstance(value, MappingProxyType):
+        return {key: _thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [_thaw(item) for item in value]
+    return value
+
+# Configuration used when no config file can be loaded; built once and shared
+_DEFAULT_CONFIG = _freeze({
+    'mapping_rules': {
+        'nodes': {
+            'application': {
+                'type': 'application-component',
+                'attributes': ['label', 'description']
+            },
+            'business': {
+                'type': 'business-actor',
+                'attributes': ['label', 'description']
+            },
+            'technology': {
+                'type': 'technology-node',
+                'attributes': ['label', 'description']
+            }
+        },
+        'relationships': {
+            'uses': {
+                'type': 'serving-relationship',
+                'attributes': ['label']
+            },
+            'flows': {
+                'type': 'flow-relationship',
+                'attributes': ['label']
+            }
+        }
+    },
+    'archimate': {
+        'namespace': 'http://www.opengroup.org/xsd/archimate/3.0/',
+        'schema_location': 'http://www.opengroup.org/xsd/archimate/3.0/ http://www.opengroup.org/xsd/archimate/3.0/archimate3_Diagram.xsd'
+    }
+})
+
 class Settings:
     """Settings class for dot2archimate."""
     
@@ -13,42 +65,10 @@ class Settings:
     def _load_config(self) -> Dict[str, Any]:
         """Load configuration from YAML file."""
         try:
-            with open(self.config_path, 'r') as f:
-                return yaml.safe_load(f)
+            return yaml_compat.load_file(self.config_path)
         except Exception as e:
-            # Return default configuration if file not found
-            return {
-                'mapping_rules': {
-                    'nodes': {
-                        'application': {
-                            'type': 'application-component',
-                            'attributes': ['label', 'description']
-                        },
-                        'business': {
-                            'type': 'business-actor',
-                            'attributes': ['label', 'description']
-                        },
-                        'technology': {
-                            'type': 'technology-node',
-                            'attributes': ['label', 'description']
-                        }
-                    },
-                    'relationships': {
-                        'uses': {
-                            'type': 'serving-relationship',
-                            'attributes': ['label']
-                        },
-                        'flows': {
-                            'type': 'flow-relationship',
-                            'attributes': ['label']
-                        }
-                    }
-                },
-                'archimate': {
-                    'namespace': 'http://www.opengroup.org/xsd/archimate/3.0/',
-                    'schema_location': 'http://www.opengroup.org/xsd/archimate/3.0/ http://www.opengroup.org/xsd/archimate/3.0/archimate3_Diagram.xsd'
-                }
-            }
+            # Fall back to the read-only default configuration if the file is missing
+            return _DEFAULT_CONFIG
     
     def get_mapping_rules(self) -> Dict[str, Any]:
         """Get mapping rules from configuration."""
@@ -65,6 +85,9 @@ class Settings:
     
     def save_config(self, config: Dict[str, Any]) -> None:
         """Save configuration to YAML file."""
-        with open(self.config_path, 'w') as f:
-            yaml.dump(config, f, default_flow_style=False)
+        if isinstance(config, MappingProxyType):
+            # The shared default is read-only; save and keep a mutable copy
+            config = _thaw(config)
+        with open(self.config_path, 'wb') as f:
+            yaml_compat.dump(config, f, encoding='utf-8')
         self.config = config 
\ No newline at end of file
@@ -0,0 +1,38 @@
+import copy
+import functools
+import os
+
+import yaml
+
+# Prefer the libyaml-backed C loader/dumper; fall back to pure Python without it
+try:
+    from yaml import CSafeLoader as SafeLoader, CSafeDumper as SafeDumper
+except ImportError:
+    from yaml import SafeLoader, SafeDumper
+
+def load(stream):
+    """Load YAML from a string or file with the fastest available safe loader."""
+    return yaml.load(stream, Loader=SafeLoader)
+
+def dump(data, stream=None, encoding=None):
+    """Dump data as block-style YAML with the fastest available safe dumper.
+
+    Keys keep their insertion order. With an encoding the YAML is written as
+    bytes, so stream must then be a binary file.
+    """
+    return yaml.dump(data, stream, Dumper=SafeDumper, default_flow_style=False, allow_unicode=True,
+                     sort_keys=False, encoding=encoding)
+
+@functools.lru_cache(maxsize=32)
+def _load_file_cached(path: str, mtime_ns: int, size: int):
+    """Parse a YAML file, cached per absolute path, modification time and size."""
+    with open(path, 'r') as f:
+        return load(f)
+
+def load_file(path):
+    """Load a YAML file, reusing the parsed content while the file is unchanged.
+
+    A deep copy is returned so callers can't mutate the cached data.
+    """
+    st = os.stat(path)
+    return copy.deepcopy(_load_file_cached(os.path.abspath(path), st.st_mtime_ns, st.st_size))
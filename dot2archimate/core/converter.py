@@ -1,28 +1,103 @@
+import contextlib
+import hashlib
 import logging
-from dot2archimate.core.parser import DotParser
-from dot2archimate.core.mapper import ArchimateMapper
-from dot2archimate.core.generator import ArchimateXMLGenerator
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+from dot2archimate import __version__
+from dot2archimate.core.factory import get_pipeline
+
+# Generated XML is cached here, keyed by the input, the config content, the
+# output style and the package version
+CACHE_DIR = Path(os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache') / 'dot2archimate'
+
+# Least recently used entries beyond this many are removed from the cache
+CACHE_MAX_ENTRIES = 256
 
 class Converter:
     """Converter for DOT to ArchiMate."""
 
-    def __init__(self, config_path=None):
+    def __init__(self, config_path=None, use_cache=True, cache_dir=None, pretty_print=False):
         self.logger = logging.getLogger(__name__)
-        self.parser = DotParser()
-        self.mapper = ArchimateMapper(config_path)
-        self.generator = ArchimateXMLGenerator()
+        self.config_path = config_path
+        self.use_cache = use_cache
+        self.pretty_print = pretty_print
+        self.cache_dir = Path(cache_dir) if cache_dir else CACHE_DIR
+        self.parser, self.mapper, self.generator = get_pipeline(config_path)
+
+    def _cache_path(self, dot_bytes: bytes) -> Path:
+        """Return the cache entry for a DOT input under the current config."""
+        key = hashlib.blake2b(digest_size=20)
+        # The package version covers changes to the mapping code and the
+        # built-in default rules
+        key.update(f"{__version__}\0{'pretty' if self.pretty_print else 'compact'}\0".encode('utf-8'))
+        if self.config_path:
+            with open(self.config_path, 'rb') as f:
+                key.update(hashlib.blake2b(f.read(), digest_size=20).digest())
+        key.update(b'\0')
+        key.update(dot_bytes)
+        return self.cache_dir / f"{key.hexdigest()}.xml"
+
+    def _store(self, cache_path: Path, xml_output: bytes):
+        """Write a cache entry atomically; a failed write only costs a cache miss."""
+        tmp_path = None
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(xml_output)
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            self.logger.warning("Could not write cache entry %s: %s", cache_path, e)
+            if tmp_path is not None:
+                with contextlib.suppress(OSError):
+                    os.unlink(tmp_path)
+            return
+        self._prune()
+
+    def _prune(self):
+        """Remove the least recently used cache entries beyond CACHE_MAX_ENTRIES."""
+        try:
+            entries = [entry for entry in os.scandir(self.cache_dir)
+                       if entry.name.endswith('.xml') and entry.is_file()]
+            if len(entries) <= CACHE_MAX_ENTRIES:
+                return
+            entries.sort(key=lambda entry: entry.stat().st_mtime_ns)
+            for entry in entries[:len(entries) - CACHE_MAX_ENTRIES]:
+                os.unlink(entry.path)
+        except OSError as e:
+            self.logger.warning("Could not prune cache %s: %s", self.cache_dir, e)
 
     def convert(self, input_file, output_file):
         """Convert a DOT file to an ArchiMate XML file."""
-        self.logger.info(f"Converting {input_file} to {output_file}")
-        
-        # Parse DOT file
-        dot_data = self.parser.parse_file(input_file)
-        
+        self.logger.info("Converting %s to %s", input_file, output_file)
+
+        with open(input_file, 'rb') as f:
+            dot_bytes = f.read()
+
+        cache_path = self._cache_path(dot_bytes) if self.use_cache else None
+        if cache_path is not None and cache_path.is_file():
+            shutil.copyfile(cache_path, output_file)
+            # Mark the entry as recently used so pruning keeps it
+            with contextlib.suppress(OSError):
+                os.utime(cache_path)
+            self.logger.info("Reused cached output for %s", input_file)
+            return
+
+        # Parse DOT content
+        dot_data = self.parser.parse_stream([dot_bytes])
+
         # Map DOT elements to ArchiMate elements
         archimate_data = self.mapper.map_to_archimate(dot_data)
-        
+
         # Generate ArchiMate XML
-        self.generator.generate_xml(archimate_data, output_file)
-        
-        self.logger.info(f"Successfully converted {input_file} to {output_file}") 
\ No newline at end of file
+        xml_output = self.generator.generate_xml_bytes(archimate_data, pretty_print=self.pretty_print)
+        with open(output_file, 'wb') as f:
+            f.write(xml_output)
+
+        if cache_path is not None:
+            self._store(cache_path, xml_output)
+
+        self.logger.info("Successfully converted %s to %s", input_file, output_file)
@@ -0,0 +1,15 @@
+from functools import lru_cache
+from typing import Tuple
+
+from dot2archimate.core.parser import DotParser
+from dot2archimate.core.mapper import ArchimateMapper
+from dot2archimate.core.generator import ArchimateXMLGenerator
+
+@lru_cache(maxsize=8)
+def get_pipeline(config_path: str) -> Tuple[DotParser, ArchimateMapper, ArchimateXMLGenerator]:
+    """Return the parser, mapper and generator for a configuration file.
+
+    The components are built once per config path and reused for the rest of
+    the process, so the mapping configuration is only loaded once.
+    """
+    return DotParser(), ArchimateMapper(config_path), ArchimateXMLGenerator()
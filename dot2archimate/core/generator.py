@@ -2,116 +2,221 @@ from typing import Dict, Any
 from lxml import etree
 from logging import getLogger
 
+from dot2archimate.core.model import ArchimateElement, ArchimateRelationship, as_element, as_relationship
+
 logger = getLogger(__name__)
 
+XML_DECLARATION_BYTES = b'<?xml version="1.0" encoding="UTF-8"?>\n'
+
+# Schema location attribute set on every model root
+SCHEMA_LOCATION_QNAME = '{http://www.w3.org/2001/XMLSchema-instance}schemaLocation'
+SCHEMA_LOCATION = 'http://www.opengroup.org/xsd/archimate/3.0/ http://www.opengroup.org/xsd/archimate/3.0/archimate3_Diagram.xsd'
+ROOT_ATTRIB = {SCHEMA_LOCATION_QNAME: SCHEMA_LOCATION}
+
 class ArchimateXMLGenerator:
     def __init__(self, config_path: str = None):
         self.nsmap = {
             'archimate': 'http://www.opengroup.org/xsd/archimate/3.0/',
             'xsi': 'http://www.w3.org/2001/XMLSchema-instance'
         }
+        # Namespace-qualified tag names, built once instead of per element
+        self._ns = self.nsmap['archimate']
+        self._tag = {
+            name: f"{{{self._ns}}}{name}"
+            for name in ('model', 'elements', 'relationships', 'documentation', 'properties', 'property')
+        }
+        self._type_tag_cache = {}
 
-    def generate_xml(self, archimate_data: Dict[str, Any]) -> str:
-        """Generate ArchiMate XML from mapped data."""
-        try:
-            # Create root element
-            root = etree.Element(
-                f"{{{self.nsmap['archimate']}}}model",
-                nsmap=self.nsmap
-            )
-
-            # Add schema location
-            root.set(
-                f"{{{self.nsmap['xsi']}}}schemaLocation",
-                "http://www.opengroup.org/xsd/archimate/3.0/ http://www.opengroup.org/xsd/archimate/3.0/archimate3_Diagram.xsd"
-            )
+    def _qn(self, name: str) -> str:
+        """Return the namespace-qualified tag for an element or relationship type."""
+        tag = self._type_tag_cache.get(name)
+        if tag is None:
+            tag = self._type_tag_cache[name] = f"{{{self._ns}}}{name}"
+        return tag
 
-            # Add elements
-            elements = etree.SubElement(root, f"{{{self.nsmap['archimate']}}}elements")
-            for element in archimate_data['elements']:
-                self._add_element(elements, element)
+    def generate_xml(self, archimate_data: Dict[str, Any], pretty_print: bool = False) -> str:
+        """Generate ArchiMate XML from mapped data, indented only if pretty_print is set."""
+        # Serialize to UTF-8 once and decode the finished document, rather
+        # than serializing to str and prepending the declaration
+        return self.generate_xml_bytes(archimate_data, pretty_print).decode('utf-8')
 
-            # Add relationships
-            relationships = etree.SubElement(root, f"{{{self.nsmap['archimate']}}}relationships")
-            for relationship in archimate_data['relationships']:
-                self._add_relationship(relationships, relationship)
+    def generate_xml_bytes(self, archimate_data: Dict[str, Any], pretty_print: bool = False) -> bytes:
+        """Generate ArchiMate XML from mapped data as UTF-8 encoded bytes."""
+        try:
+            root = self._build_tree(archimate_data)
 
-            # Return formatted XML
-            xml_declaration = '<?xml version="1.0" encoding="UTF-8"?>\n'
+            # Let lxml encode directly instead of encoding a str afterwards
             xml_content = etree.tostring(
                 root,
-                pretty_print=True,
-                encoding='unicode',
+                pretty_print=pretty_print,
+                encoding='UTF-8',
                 xml_declaration=False
             )
-            return xml_declaration + xml_content
+            return XML_DECLARATION_BYTES + xml_content
+        except Exception as e:
+            logger.error("XML generation failed: %s", e)
+            raise ValueError(f"Failed to generate XML: {e}")
+
+    def _build_tree(self, archimate_data: Dict[str, Any]) -> etree.Element:
+        """Build the ArchiMate model element tree from mapped data."""
+        # Create root element with its schema location
+        root = etree.Element(
+            self._tag['model'],
+            attrib=ROOT_ATTRIB,
+            nsmap=self.nsmap
+        )
+
+        # Children are always created in place with SubElement and without an
+        # nsmap, so they share the root's document and namespace declarations.
+        # Appending separately built elements would make lxml fix up the
+        # namespaces on every append, which scales quadratically.
+
+        # Add elements
+        elements = etree.SubElement(root, self._tag['elements'])
+        for element in archimate_data['elements']:
+            self._add_element(elements, as_element(element))
+
+        # Add relationships
+        relationships = etree.SubElement(root, self._tag['relationships'])
+        for relationship in archimate_data['relationships']:
+            self._add_relationship(relationships, as_relationship(relationship))
+
+        return root
+
+    def write_xml(self, archimate_data: Dict[str, Any], fileobj) -> None:
+        """Write ArchiMate XML from mapped data to a binary file object as it is generated."""
+        try:
+            self._stream_xml(archimate_data, fileobj)
         except Exception as e:
-            logger.error(f"XML generation failed: {e}")
+            logger.error("XML generation failed: %s", e)
             raise ValueError(f"Failed to generate XML: {e}")
 
-    def _add_element(self, parent: etree.Element, element: Dict[str, Any]):
+    def convert(self, mapper, graph_data: Dict[str, Any], fileobj) -> None:
+        """Map a parsed graph and write its ArchiMate XML to a binary file object in one pass.
+
+        Each element and relationship is written as soon as the mapper has
+        produced it, without collecting the mapped model first.
+        """
+        self.write_xml(mapper.iter_archimate(graph_data), fileobj)
+
+    def _stream_xml(self, archimate_data: Dict[str, Any], fileobj) -> None:
+        """Serialize the model incrementally to fileobj, one entry at a time.
+
+        lxml buffers the output and writes it to fileobj in blocks.
+        """
+        fileobj.write(XML_DECLARATION_BYTES)
+        with etree.xmlfile(fileobj, encoding='UTF-8') as xf:
+            with xf.element(
+                self._tag['model'],
+                nsmap=self.nsmap,
+                attrib=ROOT_ATTRIB
+            ):
+                with xf.element(self._tag['elements']):
+                    for element in archimate_data['elements']:
+                        self._write_element(xf, as_element(element))
+
+                with xf.element(self._tag['relationships']):
+                    for relationship in archimate_data['relationships']:
+                        self._write_relationship(xf, as_relationship(relationship))
+        fileobj.write(b'\n')
+
+    def _write_element(self, xf, element: ArchimateElement):
+        """Write an ArchiMate element to an incremental XML writer."""
+        with xf.element(self._qn(element.type), attrib={'id': element.id, 'name': element.name}):
+            if element.documentation:
+                with xf.element(self._tag['documentation']):
+                    xf.write(element.documentation)
+
+            if element.properties:
+                # Handle properties as dictionary or list
+                if isinstance(element.properties, dict):
+                    properties = [
+                        (key if type(key) is str else str(key), value if type(value) is str else str(value))
+                        for key, value in element.properties.items()
+                    ]
+                else:
+                    properties = [(prop['key'], prop['value']) for prop in element.properties]
+                self._write_properties(xf, properties)
+
+    def _write_relationship(self, xf, relationship: ArchimateRelationship):
+        """Write an ArchiMate relationship to an incremental XML writer."""
+        attrib = {
+            'id': relationship.id,
+            'source': relationship.source,
+            'target': relationship.target
+        }
+        if relationship.name:
+            attrib['name'] = relationship.name
+
+        with xf.element(self._qn(relationship.type), attrib=attrib):
+            if relationship.properties:
+                self._write_properties(
+                    xf,
+                    [(prop['key'], prop['value']) for prop in relationship.properties]
+                )
+
+    def _write_properties(self, xf, properties):
+        """Write (key, value) pairs as an ArchiMate properties block."""
+        with xf.element(self._tag['properties']):
+            for key, value in properties:
+                with xf.element(self._tag['property'], attrib={'key': key, 'value': value}):
+                    pass
+
+    def _add_element(self, parent: etree.Element, element: ArchimateElement):
         """Add an ArchiMate element to the XML tree."""
+        # Pass attributes at creation time rather than with separate set() calls
         elem = etree.SubElement(
             parent,
-            f"{{{self.nsmap['archimate']}}}{element['type']}"
+            self._qn(element.type),
+            attrib={'id': element.id, 'name': element.name}
         )
-        elem.set('id', element['id'])
-        elem.set('name', element['name'])
 
-        if element['documentation']:
-            documentation = etree.SubElement(
-                elem,
-                f"{{{self.nsmap['archimate']}}}documentation"
-            )
-            documentation.text = element['documentation']
+        if element.documentation:
+            documentation = etree.SubElement(elem, self._tag['documentation'])
+            documentation.text = element.documentation
+
+        if element.properties:
+            properties = etree.SubElement(elem, self._tag['properties'])
 
-        if element['properties']:
-            properties = etree.SubElement(
-                elem,
-                f"{{{self.nsmap['archimate']}}}properties"
-            )
-            
             # Handle properties as dictionary or list
-            if isinstance(element['properties'], dict):
-                for key, value in element['properties'].items():
-                    property_elem = etree.SubElement(
-                        properties,
-                        f"{{{self.nsmap['archimate']}}}property"
-                    )
-                    property_elem.set('key', str(key))
-                    property_elem.set('value', str(value))
+            if isinstance(element.properties, dict):
+                self._add_dict_properties(properties, element.properties)
             else:
-                # Handle properties as list of dictionaries with 'key' and 'value'
-                for prop in element['properties']:
-                    property_elem = etree.SubElement(
-                        properties,
-                        f"{{{self.nsmap['archimate']}}}property"
-                    )
-                    property_elem.set('key', prop['key'])
-                    property_elem.set('value', prop['value'])
-
-    def _add_relationship(self, parent: etree.Element, relationship: Dict[str, Any]):
+                self._add_list_properties(properties, element.properties)
+
+    def _add_dict_properties(self, parent: etree.Element, properties: Dict[str, Any]):
+        """Add property elements for a key -> value mapping."""
+        # Attributes are passed as keywords, which lxml applies without an
+        # intermediate attrib dict
+        property_tag = self._tag['property']
+        sub_element = etree.SubElement
+        for key, value in properties.items():
+            # Most keys and values are strings already, so skip str() for them
+            sub_element(
+                parent, property_tag,
+                key=key if type(key) is str else str(key),
+                value=value if type(value) is str else str(value)
+            )
+
+    def _add_list_properties(self, parent: etree.Element, properties):
+        """Add property elements for a list of dictionaries with 'key' and 'value'."""
+        property_tag = self._tag['property']
+        sub_element = etree.SubElement
+        for prop in properties:
+            sub_element(parent, property_tag, key=prop['key'], value=prop['value'])
+
+    def _add_relationship(self, parent: etree.Element, relationship: ArchimateRelationship):
         """Add an ArchiMate relationship to the XML tree."""
-        rel = etree.SubElement(
-            parent,
-            f"{{{self.nsmap['archimate']}}}{relationship['type']}"
-        )
-        rel.set('id', relationship['id'])
-        rel.set('source', relationship['source'])
-        rel.set('target', relationship['target'])
+        attrib = {
+            'id': relationship.id,
+            'source': relationship.source,
+            'target': relationship.target
+        }
+        if relationship.name:
+            attrib['name'] = relationship.name
 
-        if relationship['name']:
-            rel.set('name', relationship['name'])
+        rel = etree.SubElement(parent, self._qn(relationship.type), attrib=attrib)
 
-        if relationship['properties']:
-            properties = etree.SubElement(
-                rel,
-                f"{{{self.nsmap['archimate']}}}properties"
-            )
-            for prop in relationship['properties']:
-                property_elem = etree.SubElement(
-                    properties,
-                    f"{{{self.nsmap['archimate']}}}property"
-                )
-                property_elem.set('key', prop['key'])
-                property_elem.set('value', prop['value']) 
\ No newline at end of file
+        if relationship.properties:
+            properties = etree.SubElement(rel, self._tag['properties'])
+            self._add_list_properties(properties, relationship.properties)
@@ -1,465 +1,589 @@
-from typing import Dict, Any, List
-import yaml
+from typing import Dict, Any, Iterator, List, NamedTuple, Optional, Tuple, Union
+from itertools import count, product
 from logging import getLogger
-import uuid
+import random
 import re
+import sys
+from types import MappingProxyType
+
+from dot2archimate.config import yaml_compat
+from dot2archimate.core.model import ArchimateElement, ArchimateRelationship, DotEdge, DotNode, as_edge, as_node
 
 logger = getLogger(__name__)
 
+# Attributes that are mapped to dedicated fields rather than properties
+_NODE_PROPERTY_EXCLUDES = frozenset({'type', 'label', 'description'})
+_EDGE_PROPERTY_EXCLUDES = frozenset({'label', 'type', 'description', 'shape'})
+
+# Terraform address such as aws_instance.web; group 1 is the resource type
+_TF_RESOURCE_RE = re.compile(r'([a-zA-Z0-9_]+)\.([a-zA-Z0-9_]+)')
+
+# Resource type prefixes of the supported cloud providers
+_CLOUD_RESOURCE_PREFIXES = ('aws_', 'azurerm_', 'azuread_', 'google_')
+
+# Terraform node name decorations: the [root] prefix and (expand) suffixes,
+# and the provider[...] wrapper and quotes around provider names
+_TF_NAME_DECORATIONS_RE = re.compile(r'^\[root\] | \(expand\)')
+_TF_PROVIDER_WRAPPER_RE = re.compile(r'provider\[|[\]"]')
+
+# Relationship types between resources of the same cloud provider, as
+# (provider, sources, targets, relationship type) groups
+_CLOUD_RELATIONSHIP_GROUPS = (
+    # AWS instance to network resources, network hierarchy, database to
+    # storage and Lambda to services
+    ('aws', ('aws_instance',), ('aws_vpc', 'aws_subnet', 'aws_security_group'), 'serving-relationship'),
+    ('aws', ('aws_subnet', 'aws_security_group'), ('aws_vpc',), 'composition-relationship'),
+    ('aws', ('aws_db_instance',), ('aws_ebs_volume', 'aws_s3_bucket'), 'access-relationship'),
+    ('aws', ('aws_lambda_function',), ('aws_sqs_queue', 'aws_sns_topic', 'aws_dynamodb_table'), 'access-relationship'),
+    # Azure VM to network resources, network hierarchy, database to storage
+    # and function to services
+    ('azure', ('azurerm_virtual_machine', 'azurerm_linux_virtual_machine', 'azurerm_windows_virtual_machine'),
+     ('azurerm_virtual_network', 'azurerm_subnet', 'azurerm_network_security_group'), 'serving-relationship'),
+    ('azure', ('azurerm_subnet',), ('azurerm_virtual_network',), 'composition-relationship'),
+    ('azure', ('azurerm_sql_server', 'azurerm_cosmosdb_account'), ('azurerm_storage_account',), 'access-relationship'),
+    ('azure', ('azurerm_function_app',), ('azurerm_storage_account', 'azurerm_servicebus_namespace', 'azurerm_eventhub'),
+     'access-relationship'),
+    # GCP instance to network resources, network hierarchy, database to
+    # storage and function to services
+    ('gcp', ('google_compute_instance',), ('google_compute_network', 'google_compute_subnetwork', 'google_compute_firewall'),
+     'serving-relationship'),
+    ('gcp', ('google_compute_subnetwork',), ('google_compute_network',), 'composition-relationship'),
+    ('gcp', ('google_sql_database_instance',), ('google_storage_bucket',), 'access-relationship'),
+    ('gcp', ('google_cloudfunctions_function',), ('google_pubsub_topic', 'google_storage_bucket', 'google_bigquery_dataset'),
+     'access-relationship'),
+)
+# The groups expanded into (provider, source type, target type) -> type
+_CLOUD_RELATIONSHIPS = {
+    (provider, source, target): relationship_type
+    for provider, sources, targets, relationship_type in _CLOUD_RELATIONSHIP_GROUPS
+    for source, target in product(sources, targets)
+}
+
+# Element types of plain DOT nodes by shape
+_SHAPE_TYPES = {
+    'box': 'application-component',
+    'ellipse': 'business-actor',
+    'diamond': 'technology-service',
+    'note': 'business-object',
+}
+
+# Relationship types implied by keywords in edge labels, in order of precedence
+_LABEL_KEYWORDS = (
+    ('uses', 'serving-relationship'),
+    ('read', 'serving-relationship'),
+    ('creates', 'assignment-relationship'),
+    ('manages', 'assignment-relationship'),
+    ('depends', 'serving-relationship'),
+    ('triggers', 'triggering-relationship'),
+    ('flows', 'flow-relationship'),
+    ('writes', 'flow-relationship'),
+)
+
+# Maximum number of distinct values whose mapping rule match is cached per mapper
+RULE_CACHE_SIZE = 4096
+_UNCACHED = object()
+
+class NodeIdParts(NamedTuple):
+    """The parts of a Terraform node id that the mapper dispatches on."""
+    # Cloud resource types among the parts of a module address, in order
+    module_resource_types: Tuple[str, ...]
+    # Type of the first "type.name" pair in the id, if any
+    resource_type: Optional[str]
+    # 'aws', 'azure' or 'gcp', if the id names a cloud resource
+    cloud_provider: Optional[str]
+
+def _parse_node_id(node_id: str) -> NodeIdParts:
+    """Split a Terraform node id into the parts the mapper dispatches on."""
+    match = _TF_RESOURCE_RE.search(node_id)
+
+    # Within a module, focus on the resource type rather than the module name,
+    # e.g. google_compute_network in module.vpc.google_compute_network.vpc
+    module_resource_types = ()
+    provider_id = node_id
+    if 'module.' in node_id:
+        module_resource_types = tuple(part for part in node_id.split('.') if part.startswith(_CLOUD_RESOURCE_PREFIXES))
+        if module_resource_types:
+            provider_id = module_resource_types[0]
+
+    # Check for cloud provider prefixes
+    if 'aws_' in provider_id:
+        cloud_provider = 'aws'
+    elif 'azurerm_' in provider_id or 'azuread_' in provider_id:
+        cloud_provider = 'azure'
+    elif 'google_' in provider_id:
+        cloud_provider = 'gcp'
+    else:
+        cloud_provider = None
+
+    return NodeIdParts(module_resource_types, match.group(1) if match else None, cloud_provider)
+
+# Parts of ids that aren't strings and so name no resource or provider
+_NO_ID_PARTS = NodeIdParts((), None, None)
+
+# ArchiMate id and node of a mapped DOT node
+MappedNode = Tuple[str, DotNode]
+
+# ArchiMate element types of cloud resources by Terraform resource type;
+# resources without an entry map to technology-node
+_CLOUD_RESOURCE_TYPES = {
+    resource_type: element_type
+    for resource_types, element_type in (
+        # AWS compute, network and database resources
+        (('aws_instance', 'aws_launch_template', 'aws_autoscaling_group',
+          'aws_vpc', 'aws_subnet', 'aws_security_group', 'aws_route_table', 'aws_internet_gateway',
+          'aws_db_instance', 'aws_rds_cluster', 'aws_elasticache_cluster'), 'technology-node'),
+        # AWS storage resources
+        (('aws_s3_bucket', 'aws_dynamodb_table', 'aws_ebs_volume'), 'technology-artifact'),
+        # AWS serverless resources
+        (('aws_lambda_function', 'aws_step_function'), 'application-function'),
+        # AWS API resources
+        (('aws_api_gateway', 'aws_api_gateway_rest_api'), 'application-interface'),
+        # AWS service resources
+        (('aws_cloudfront_distribution', 'aws_cloudwatch', 'aws_sns_topic', 'aws_sqs_queue'), 'technology-service'),
+
+        # Azure compute, network and database resources
+        (('azurerm_virtual_machine', 'azurerm_linux_virtual_machine', 'azurerm_windows_virtual_machine',
+          'azurerm_virtual_machine_scale_set',
+          'azurerm_virtual_network', 'azurerm_subnet', 'azurerm_network_security_group', 'azurerm_route_table',
+          'azurerm_public_ip',
+          'azurerm_sql_server', 'azurerm_sql_database', 'azurerm_cosmosdb_account', 'azurerm_mysql_server'),
+         'technology-node'),
+        # Azure storage and security resources
+        (('azurerm_storage_account', 'azurerm_storage_container', 'azurerm_storage_blob', 'azurerm_managed_disk',
+          'azurerm_key_vault', 'azuread_application', 'azuread_service_principal'), 'technology-artifact'),
+        # Azure serverless resources
+        (('azurerm_function_app', 'azurerm_logic_app_workflow'), 'application-function'),
+        # Azure API resources
+        (('azurerm_api_management', 'azurerm_api_management_api'), 'application-interface'),
+        # Azure service resources
+        (('azurerm_application_gateway', 'azurerm_eventhub', 'azurerm_servicebus_namespace'), 'technology-service'),
+
+        # GCP compute, network, database and container resources
+        (('google_compute_instance', 'google_compute_instance_template', 'google_compute_instance_group_manager',
+          'google_compute_network', 'google_compute_subnetwork', 'google_compute_firewall', 'google_compute_router',
+          'google_compute_global_address',
+          'google_sql_database_instance', 'google_sql_database', 'google_spanner_instance',
+          'google_container_cluster', 'google_container_node_pool'), 'technology-node'),
+        # GCP storage and security resources
+        (('google_storage_bucket', 'google_bigquery_dataset', 'google_bigquery_table',
+          'google_kms_key_ring', 'google_kms_crypto_key', 'google_service_account'), 'technology-artifact'),
+        # GCP serverless resources
+        (('google_cloudfunctions_function', 'google_cloud_run_service', 'google_cloud_scheduler_job'),
+         'application-function'),
+        # GCP API resources
+        (('google_cloud_endpoints_service', 'google_api_gateway_api', 'google_api_gateway_api_config'),
+         'application-interface'),
+        # GCP service resources
+        (('google_pubsub_topic', 'google_pubsub_subscription', 'google_cloud_tasks_queue'), 'technology-service'),
+    )
+    for resource_type in resource_types
+}
+
+# Explicit Terraform resource mappings
+_TERRAFORM_RESOURCE_TYPES = MappingProxyType({
+    # AWS resources
+    'aws_instance': 'technology-node',
+    'aws_vpc': 'technology-node',
+    'aws_subnet': 'technology-node',
+    'aws_security_group': 'technology-node',
+    'aws_route_table': 'technology-node',
+    'aws_internet_gateway': 'technology-node',
+    'aws_lb': 'technology-node',
+    'aws_db_instance': 'technology-node',
+    'aws_s3_bucket': 'technology-artifact',
+    'aws_dynamodb_table': 'technology-artifact',
+    'aws_lambda_function': 'application-function',
+    'aws_api_gateway': 'application-interface',
+    'aws_cloudfront_distribution': 'technology-service',
+    'aws_cloudwatch': 'technology-service',
+    'aws_sns_topic': 'technology-service',
+    'aws_sqs_queue': 'technology-service',
+
+    # Azure resources
+    'azurerm_virtual_machine': 'technology-node',
+    'azurerm_linux_virtual_machine': 'technology-node',
+    'azurerm_windows_virtual_machine': 'technology-node',
+    'azurerm_virtual_network': 'technology-node',
+    'azurerm_subnet': 'technology-node',
+    'azurerm_network_security_group': 'technology-node',
+    'azurerm_route_table': 'technology-node',
+    'azurerm_public_ip': 'technology-node',
+    'azurerm_sql_server': 'technology-node',
+    'azurerm_sql_database': 'technology-artifact',
+    'azurerm_storage_account': 'technology-artifact',
+    'azurerm_storage_container': 'technology-artifact',
+    'azurerm_app_service': 'application-component',
+    'azurerm_function_app': 'application-function',
+    'azurerm_api_management': 'application-interface',
+    'azurerm_application_gateway': 'technology-service',
+    'azurerm_eventhub': 'technology-service',
+    'azurerm_servicebus_namespace': 'technology-service',
+    'azurerm_cosmosdb_account': 'technology-node',
+    'azurerm_key_vault': 'technology-artifact',
+
+    # GCP resources
+    'google_compute_instance': 'technology-node',
+    'google_compute_network': 'technology-node',
+    'google_compute_subnetwork': 'technology-node',
+    'google_compute_firewall': 'technology-node',
+    'google_compute_router': 'technology-node',
+    'google_compute_global_address': 'technology-node',
+    'google_sql_database_instance': 'technology-node',
+    'google_sql_database': 'technology-artifact',
+    'google_storage_bucket': 'technology-artifact',
+    'google_container_cluster': 'technology-node',
+    'google_container_node_pool': 'technology-node',
+    'google_cloud_run_service': 'application-component',
+    'google_cloudfunctions_function': 'application-function',
+    'google_cloud_scheduler_job': 'application-function',
+    'google_pubsub_topic': 'technology-service',
+    'google_pubsub_subscription': 'technology-service',
+    'google_bigquery_dataset': 'technology-artifact',
+    'google_bigquery_table': 'technology-artifact',
+    'google_kms_key_ring': 'technology-artifact',
+
+    # Generic Terraform resources
+    'provider': 'technology-service',
+    'var': 'business-actor',
+    'data': 'business-object',
+    'module': 'grouping',
+    'output': 'business-object',
+    'local': 'business-object'
+})
+
+# Explicit Terraform mappings take precedence over the cloud defaults
+_RESOURCE_TYPE_MAP = {**_CLOUD_RESOURCE_TYPES, **_TERRAFORM_RESOURCE_TYPES}
+
+def _id_sequence() -> Iterator[str]:
+    """Return an endless iterator of ids sharing a random prefix and numbered with a counter.
+
+    Ids only need to be unique within a document; the random prefix keeps
+    ids from separately converted documents apart. The non-cryptographic
+    module-level generator is used, which is reseeded in forked worker
+    processes. The 'id-' start makes every id a valid xsd:ID. Each id string
+    is only built when it is taken from the iterator.
+    """
+    prefix = f"id-{random.getrandbits(64):016x}-"
+    return map(prefix.__add__, map(str, count()))
+
 class ArchimateMapper:
-    def __init__(self, config_path: str = None):
+    """Maps parsed DOT graphs to ArchiMate elements and relationships.
+
+    The state of a mapping lives in the call that maps the graph, and the
+    instance only holds the rules and caches of pure lookups, so one mapper
+    can map several graphs at once, including from several threads.
+    """
+
+    def __init__(self, config_path: Optional[str] = None):
         self.mapping_rules = self._load_config(config_path) if config_path else {}
-        self.element_ids = {}  # Store mapping between DOT IDs and ArchiMate IDs
-        self.terraform_resource_types = {
-            # AWS resources
-            'aws_instance': 'technology-node',
-            'aws_vpc': 'technology-node',
-            'aws_subnet': 'technology-node',
-            'aws_security_group': 'technology-node',
-            'aws_route_table': 'technology-node',
-            'aws_internet_gateway': 'technology-node',
-            'aws_lb': 'technology-node',
-            'aws_db_instance': 'technology-node',
-            'aws_s3_bucket': 'technology-artifact',
-            'aws_dynamodb_table': 'technology-artifact',
-            'aws_lambda_function': 'application-function',
-            'aws_api_gateway': 'application-interface',
-            'aws_cloudfront_distribution': 'technology-service',
-            'aws_cloudwatch': 'technology-service',
-            'aws_sns_topic': 'technology-service',
-            'aws_sqs_queue': 'technology-service',
-            
-            # Azure resources
-            'azurerm_virtual_machine': 'technology-node',
-            'azurerm_linux_virtual_machine': 'technology-node',
-            'azurerm_windows_virtual_machine': 'technology-node',
-            'azurerm_virtual_network': 'technology-node',
-            'azurerm_subnet': 'technology-node',
-            'azurerm_network_security_group': 'technology-node',
-            'azurerm_route_table': 'technology-node',
-            'azurerm_public_ip': 'technology-node',
-            'azurerm_sql_server': 'technology-node',
-            'azurerm_sql_database': 'technology-artifact',
-            'azurerm_storage_account': 'technology-artifact',
-            'azurerm_storage_container': 'technology-artifact',
-            'azurerm_app_service': 'application-component',
-            'azurerm_function_app': 'application-function',
-            'azurerm_api_management': 'application-interface',
-            'azurerm_application_gateway': 'technology-service',
-            'azurerm_eventhub': 'technology-service',
-            'azurerm_servicebus_namespace': 'technology-service',
-            'azurerm_cosmosdb_account': 'technology-node',
-            'azurerm_key_vault': 'technology-artifact',
-            
-            # GCP resources
-            'google_compute_instance': 'technology-node',
-            'google_compute_network': 'technology-node',
-            'google_compute_subnetwork': 'technology-node',
-            'google_compute_firewall': 'technology-node',
-            'google_compute_router': 'technology-node',
-            'google_compute_global_address': 'technology-node',
-            'google_sql_database_instance': 'technology-node',
-            'google_sql_database': 'technology-artifact',
-            'google_storage_bucket': 'technology-artifact',
-            'google_container_cluster': 'technology-node',
-            'google_container_node_pool': 'technology-node',
-            'google_cloud_run_service': 'application-component',
-            'google_cloudfunctions_function': 'application-function',
-            'google_cloud_scheduler_job': 'application-function',
-            'google_pubsub_topic': 'technology-service',
-            'google_pubsub_subscription': 'technology-service',
-            'google_bigquery_dataset': 'technology-artifact',
-            'google_bigquery_table': 'technology-artifact',
-            'google_kms_key_ring': 'technology-artifact',
-            
-            # Generic Terraform resources
-            'provider': 'technology-service',
-            'var': 'business-actor',
-            'data': 'business-object',
-            'module': 'grouping',
-            'output': 'business-object',
-            'local': 'business-object'
-        }
+        # Mapping rules flattened once into (substring, type) pairs, plus a
+        # cache of match results seeded with the rule keys themselves
+        self._node_rules = self._compile_rules('nodes')
+        self._node_rule_cache = self._exact_rule_matches(self._node_rules)
+        self._edge_rules = self._compile_rules('relationships')
+        self._edge_rule_cache = self._exact_rule_matches(self._edge_rules)
+        # Labels are matched against the built-in keywords before the edge rules
+        self._label_rules = _LABEL_KEYWORDS + self._edge_rules
+        self._label_rule_cache = self._exact_rule_matches(self._label_rules)
+        # Shared read-only tables; the explicit mappings are kept public
+        self.terraform_resource_types = _TERRAFORM_RESOURCE_TYPES
+        self._resource_type_map = _RESOURCE_TYPE_MAP
 
     def _load_config(self, config_path: str) -> Dict[str, Any]:
         """Load mapping rules from configuration file."""
         try:
-            with open(config_path, 'r') as f:
-                return yaml.safe_load(f)
+            # Parsed once per file version and shared by all mappers
+            return yaml_compat.load_file(config_path)
         except Exception as e:
-            logger.error(f"Failed to load mapping configuration: {e}")
+            logger.error("Failed to load mapping configuration: %s", e)
             raise ValueError(f"Invalid configuration file: {e}")
 
+    def _compile_rules(self, category: str) -> Tuple[Tuple[str, str], ...]:
+        """Flatten the node or relationship mapping rules into (substring, type) pairs."""
+        # Empty sections in the YAML file load as None
+        rules = ((self.mapping_rules or {}).get('mapping_rules') or {}).get(category) or {}
+        return tuple((rule_key, rule['type']) for rule_key, rule in rules.items())
+
+    @staticmethod
+    def _exact_rule_matches(rules: Tuple[Tuple[str, str], ...]) -> Dict[str, str]:
+        """Return the type the substring scan yields for each rule key itself."""
+        # An earlier rule key may be contained in a later one, so take the
+        # first match rather than the key's own rule
+        return {
+            rule_key: next(rule_type for substring, rule_type in rules if substring in rule_key)
+            for rule_key, _ in rules
+        }
+
+    @staticmethod
+    def _match_rule(rules: Tuple[Tuple[str, str], ...], cache: Dict[str, Optional[str]], value: str) -> Optional[str]:
+        """Return the type of the first rule whose key occurs in value, if any.
+
+        Graphs repeat the same few types and labels, so results (including
+        misses) are cached per value, up to RULE_CACHE_SIZE entries.
+        """
+        rule_type = cache.get(value, _UNCACHED)
+        if rule_type is not _UNCACHED:
+            return rule_type
+        rule_type = next((rule_type for substring, rule_type in rules if substring in value), None)
+        if len(cache) < RULE_CACHE_SIZE:
+            cache[value] = rule_type
+        return rule_type
+
     def map_to_archimate(self, graph_data: Dict[str, Any]) -> Dict[str, Any]:
         """Convert internal graph representation to ArchiMate structure."""
         try:
-            archimate_elements = []
-            archimate_relationships = []
-            
-            # Check if this is a Terraform graph
-            is_terraform = graph_data.get('is_terraform', False)
-            
-            logger.info(f"Processing graph with {len(graph_data['nodes'])} nodes and {len(graph_data['edges'])} edges")
-            logger.info(f"Is Terraform graph: {is_terraform}")
-
-            # Map nodes to ArchiMate elements
-            for node_id, node in graph_data['nodes'].items():
-                try:
-                    element = self._map_node(node, is_terraform)
-                    if element:
-                        archimate_elements.append(element)
-                except Exception as e:
-                    logger.error(f"Error mapping node {node_id}: {str(e)}")
-                    raise
-
-            # Map edges to ArchiMate relationships
-            for edge in graph_data['edges']:
-                try:
-                    relationship = self._map_edge(edge, graph_data['nodes'], is_terraform)
-                    if relationship:
-                        archimate_relationships.append(relationship)
-                except Exception as e:
-                    logger.error(f"Error mapping edge {edge.get('source', 'unknown')} -> {edge.get('target', 'unknown')}: {str(e)}")
-                    raise
+            mapped = self.iter_archimate(graph_data)
+            archimate_elements = list(mapped['elements'])
+            archimate_relationships = list(mapped['relationships'])
 
             return {
                 'elements': archimate_elements,
                 'relationships': archimate_relationships
             }
         except Exception as e:
-            logger.error(f"Mapping failed: {e}")
+            logger.error("Mapping failed: %s", e)
             raise ValueError(f"Failed to map to ArchiMate: {e}")
 
-    def _map_node(self, node: Dict[str, Any], is_terraform: bool = False) -> Dict[str, Any]:
+    def iter_archimate(self, graph_data: Dict[str, Any]) -> Dict[str, Iterator]:
+        """Map a graph lazily, producing each element and relationship on demand.
+
+        The result has the same shape as map_to_archimate's but holds
+        iterators, so a consumer such as the streaming XML writer can write
+        each record as soon as it is mapped. Relationships refer to the
+        element ids, so the elements must be consumed first.
+        """
+        # Check if this is a Terraform graph
+        is_terraform = graph_data.get('is_terraform', False)
+
+        logger.info("Processing graph with %d nodes and %d edges", len(graph_data['nodes']), len(graph_data['edges']))
+        logger.info("Is Terraform graph: %s", is_terraform)
+
+        # One id sequence for all elements and relationships of the graph
+        ids = _id_sequence()
+
+        # Map from DOT IDs to the ArchiMate ID and node of each mapped node,
+        # local to this graph and sized for it: creating all keys at once
+        # avoids repeated resizing
+        mapped_nodes = dict.fromkeys(graph_data['nodes'])
+        # Parsed node ids of this graph, shared by its nodes and edges
+        id_parts = {}
+
+        return {
+            'elements': self._iter_elements(graph_data['nodes'], mapped_nodes, is_terraform, ids, id_parts),
+            'relationships': self._iter_relationships(graph_data['edges'], mapped_nodes, is_terraform, ids, id_parts)
+        }
+
+    def _iter_elements(self, nodes: Dict[str, Union[DotNode, Dict[str, Any]]],
+                       mapped_nodes: Dict[str, Optional[MappedNode]], is_terraform: bool,
+                       ids: Iterator[str], id_parts: Dict[str, NodeIdParts]) -> Iterator[ArchimateElement]:
+        """Map nodes to ArchiMate elements."""
+        # Hand-built graphs may hold plain dicts rather than parsed records
+        for node in map(as_node, nodes.values()):
+            try:
+                element = self._map_node(node, mapped_nodes, is_terraform, next(ids), id_parts)
+                if element:
+                    yield element
+            except Exception as e:
+                logger.error("Error mapping node %s: %s", node.id, e)
+                raise
+
+    def _iter_relationships(self, edges: List[Union[DotEdge, Dict[str, Any]]],
+                            mapped_nodes: Dict[str, Optional[MappedNode]], is_terraform: bool,
+                            ids: Iterator[str], id_parts: Dict[str, NodeIdParts]) -> Iterator[ArchimateRelationship]:
+        """Map edges to ArchiMate relationships."""
+        for edge in map(as_edge, edges):
+            try:
+                relationship = self._map_edge(edge, mapped_nodes, is_terraform, next(ids), id_parts)
+                if relationship:
+                    yield relationship
+            except Exception as e:
+                logger.error("Error mapping edge %s -> %s: %s", edge.source, edge.target, e)
+                raise
+
+    def _map_node(self, node: DotNode, mapped_nodes: Dict[str, Optional[MappedNode]], is_terraform: bool,
+                  archimate_id: str, id_parts: Dict[str, NodeIdParts]) -> Optional[ArchimateElement]:
         """Map a single node to an ArchiMate element."""
         try:
-            node_id = node['id']
-            display_id = node.get('display_id', node_id)
-            attributes = node['attributes']
+            node_id = node.id
+            display_id = node.display_id
+            attributes = node.attributes
             
-            logger.debug(f"Mapping node in mapper: id={node_id}, display_id={display_id}")
-            logger.debug(f"Node attributes in mapper: {attributes}")
-            
-            logger.info(f"Mapping node: id={node_id}, display_id={display_id}")
+            logger.debug("Mapping node: id=%s, display_id=%s", node_id, display_id)
+            logger.debug("Node attributes: %s", attributes)
             
             # Determine element type
-            node_type = self._determine_node_type(display_id, attributes, is_terraform)
-            logger.info(f"Determined node type: {node_type}")
+            node_type = self._determine_node_type(display_id, attributes, is_terraform, id_parts)
+            logger.debug("Determined node type: %s", node_type)
             
             if not node_type:
-                logger.warning(f"Could not determine node type for {display_id}")
+                logger.warning("Could not determine node type for %s", display_id)
                 return None
 
-            archimate_id = str(uuid.uuid4())
-            self.element_ids[node_id] = archimate_id
+            mapped_nodes[node_id] = (archimate_id, node)
 
             # Get the node name from label or ID
-            node_name = node.get('label', attributes.get('label', display_id))
+            node_name = node.label
             
             # Clean up Terraform node names
             if is_terraform and isinstance(node_name, str):
-                logger.info(f"Original node name: {node_name}")
-                # Remove [root] prefix if present
-                if node_name.startswith('[root] '):
-                    node_name = node_name[7:]
-                # Remove (expand) suffix if present
-                if ' (expand)' in node_name:
-                    node_name = node_name.replace(' (expand)', '')
+                logger.debug("Original node name: %s", node_name)
+                # Remove the [root] prefix and (expand) suffix in one pass
+                node_name = _TF_NAME_DECORATIONS_RE.sub('', node_name)
                 # Handle provider nodes
                 if node_name.startswith('provider['):
-                    node_name = node_name.replace('provider[', '').replace(']', '')
-                    node_name = node_name.replace('"', '')
-                    node_name = f"Provider: {node_name}"
-                logger.info(f"Cleaned node name: {node_name}")
+                    node_name = f"Provider: {_TF_PROVIDER_WRAPPER_RE.sub('', node_name)}"
+                logger.debug("Cleaned node name: %s", node_name)
             
             # Prepare documentation
             documentation = attributes.get('description', '')
             
             # Add module information to documentation if available
             if 'module_path' in attributes:
-                logger.debug(f"Found module_path in attributes: {attributes['module_path']}")
+                logger.debug("Found module_path in attributes: %s", attributes['module_path'])
                 module_info = f"Module: {attributes['module_path']}"
                 if documentation:
                     documentation = f"{documentation}\n\n{module_info}"
                 else:
                     documentation = module_info
             
-            # Extract properties (excluding certain keys)
-            # Use a simple dictionary comprehension to extract properties
-            properties = {k: v for k, v in attributes.items() if k not in ['type', 'label', 'description']}
-            
-            # Add module path as a property if it exists
-            if 'module_path' in attributes:
-                properties['module_path'] = attributes['module_path']
+            # Extract properties (excluding certain keys); this includes the
+            # module path, if any
+            properties = {k: v for k, v in attributes.items() if k not in _NODE_PROPERTY_EXCLUDES}
             
-            logger.debug(f"Final properties: {properties}")
+            logger.debug("Final properties: %s", properties)
 
-            return {
-                'id': archimate_id,
-                'type': node_type,
-                'name': node_name,
-                'documentation': documentation,
-                'properties': properties
-            }
+            # Interned so that all elements of a type share one string, whether
+            # it came from a literal, the mapping rules or the node's attributes
+            return ArchimateElement(archimate_id, sys.intern(node_type), node_name, documentation, properties)
         except Exception as e:
-            logger.error(f"Error in _map_node for {node.get('id', 'unknown')}: {str(e)}", exc_info=True)
+            logger.error("Error in _map_node for %s: %s", node.id, e, exc_info=True)
             raise
 
-    def _map_edge(self, edge: Dict[str, Any], nodes: Dict[str, Dict[str, Any]], is_terraform: bool = False) -> Dict[str, Any]:
+    def _map_edge(self, edge: DotEdge, mapped_nodes: Dict[str, Optional[MappedNode]], is_terraform: bool,
+                  archimate_id: str, id_parts: Dict[str, NodeIdParts]) -> Optional[ArchimateRelationship]:
         """Map a single edge to an ArchiMate relationship."""
-        source_id = edge['source']
-        target_id = edge['target']
-        attributes = edge['attributes']
-        
-        # Get source and target nodes
-        source_node = nodes.get(source_id)
-        target_node = nodes.get(target_id)
+        source_id = edge.source
+        target_id = edge.target
+        attributes = edge.attributes
         
-        if not source_node or not target_node:
+        # Get the source and target ArchiMate IDs and nodes, skipping the edge
+        # before any type matching if either end is unknown or was not mapped
+        source = mapped_nodes.get(source_id)
+        if not source:
             return None
+        target = mapped_nodes.get(target_id)
+        if not target:
+            return None
+        source_archimate_id, source_node = source
+        target_archimate_id, target_node = target
         
         # Determine relationship type
-        relationship_type = self._determine_relationship_type(attributes, source_node, target_node, is_terraform)
-        
-        # Get source and target ArchiMate IDs
-        source_archimate_id = self.element_ids.get(source_id)
-        target_archimate_id = self.element_ids.get(target_id)
-        
-        if not source_archimate_id or not target_archimate_id:
-            return None
+        relationship_type = self._determine_relationship_type(attributes, source_node, target_node, is_terraform, id_parts)
 
-        return {
-            'id': str(uuid.uuid4()),
-            'type': relationship_type,
-            'source': source_archimate_id,
-            'target': target_archimate_id,
-            'name': attributes.get('label', ''),
-            'properties': self._extract_properties(attributes)
-        }
+        return ArchimateRelationship(
+            archimate_id,
+            sys.intern(relationship_type),
+            source_archimate_id,
+            target_archimate_id,
+            attributes.get('label', ''),
+            # Remaining attributes as key/value properties
+            [{'key': k, 'value': v} for k, v in attributes.items() if k not in _EDGE_PROPERTY_EXCLUDES]
+        )
 
-    def _determine_node_type(self, node_id: str, attributes: Dict[str, str], is_terraform: bool = False) -> str:
-        """Determine ArchiMate element type based on node attributes and ID."""
+    def _determine_node_type(self, node_id: str, attributes: Dict[str, str], is_terraform: bool = False,
+                             id_parts: Optional[Dict[str, NodeIdParts]] = None) -> str:
+        """Determine ArchiMate element type based on node attributes and ID.
+
+        ``id_parts`` caches the parsed node ids of the graph being mapped.
+        """
         try:
-            logger.info(f"Determining node type for: {node_id}")
-            
             # First check if the node has an explicit type attribute
             if 'type' in attributes:
                 node_type = attributes['type'].lower()
-                logger.info(f"Node has explicit type attribute: {node_type}")
-                for rule_type, rule in self.mapping_rules.get('mapping_rules', {}).get('nodes', {}).items():
-                    if rule_type in node_type:
-                        return rule['type']
-                return node_type  # Return the type as is if no mapping found
+                logger.debug("Node has explicit type attribute: %s", node_type)
+                # Return the type as is if no mapping found
+                return self._match_rule(self._node_rules, self._node_rule_cache, node_type) or node_type
             
             # For Terraform resources, determine type based on resource type
             if is_terraform:
-                logger.info(f"Processing Terraform node: {node_id}")
-                
-                # Extract resource type from Terraform node ID
-                terraform_pattern = r'([a-zA-Z0-9_]+)\.([a-zA-Z0-9_]+)'
-                match = re.search(terraform_pattern, node_id)
-                
-                # If it's a module, try to extract the actual resource type
-                if 'module.' in node_id:
-                    logger.info(f"Found module in node ID: {node_id}")
-                    parts = node_id.split('.')
-                    for part in parts:
-                        if part.startswith(('aws_', 'azurerm_', 'azuread_', 'google_')):
-                            logger.info(f"Extracted resource type from module: {part}")
-                            resource_type = part
-                            # Check if we have a mapping for this resource type
-                            if resource_type in self.terraform_resource_types:
-                                return self.terraform_resource_types[resource_type]
-                    
-                    # If we couldn't find a specific resource type but it's a module
-                    if node_id.startswith('module.'):
-                        logger.info(f"No specific resource type found, treating as module: {node_id}")
-                        return 'application-component'
-                
-                if match:
-                    resource_type = match.group(1)
-                    logger.info(f"Extracted resource type: {resource_type}")
-                    
-                    # Check if we have a mapping for this resource type
-                    if resource_type in self.terraform_resource_types:
-                        logger.info(f"Found mapping for resource type: {resource_type} -> {self.terraform_resource_types[resource_type]}")
-                        return self.terraform_resource_types[resource_type]
-                    
-                    # Handle variables
-                    if resource_type == 'var':
-                        logger.info("Resource type is a variable, mapping to business-actor")
-                        return 'business-actor'
-                    
-                    # Handle modules
-                    if resource_type == 'module':
-                        logger.info("Resource type is a module, mapping to application-component")
-                        return 'application-component'
-                    
-                    # Handle providers
-                    if resource_type == 'provider':
-                        logger.info("Resource type is a provider, mapping to technology-service")
-                        return 'technology-service'
-                    
-                    # Handle cloud-specific resources by prefix
-                    if resource_type.startswith('aws_'):
-                        logger.info(f"Resource type is AWS, determining specific type for: {resource_type}")
-                        return self._determine_aws_resource_type(resource_type)
-                    elif resource_type.startswith('azurerm_') or resource_type.startswith('azuread_'):
-                        logger.info(f"Resource type is Azure, determining specific type for: {resource_type}")
-                        return self._determine_azure_resource_type(resource_type)
-                    elif resource_type.startswith('google_'):
-                        logger.info(f"Resource type is GCP, determining specific type for: {resource_type}")
-                        return self._determine_gcp_resource_type(resource_type)
-                
-                # If all else fails but it's a Terraform node, default to technology-node
-                logger.info(f"No specific type found for Terraform node, defaulting to technology-node: {node_id}")
-                return 'technology-node'
+                return self._determine_terraform_node_type(node_id, id_parts)
             
             # Default case: try to determine based on shape attribute
             if 'shape' in attributes:
                 shape = attributes['shape'].lower()
-                logger.info(f"Determining type based on shape: {shape}")
-                if shape == 'box':
-                    return 'application-component'
-                elif shape == 'ellipse':
-                    return 'business-actor'
-                elif shape == 'diamond':
-                    return 'technology-service'
-                elif shape == 'note':
-                    return 'business-object'
+                logger.debug("Determining type based on shape: %s", shape)
+                shape_type = _SHAPE_TYPES.get(shape)
+                if shape_type:
+                    return shape_type
             
             # If all else fails, default to application-component
-            logger.info(f"No type determined, defaulting to application-component: {node_id}")
+            logger.debug("No type determined, defaulting to application-component: %s", node_id)
             return 'application-component'
         except Exception as e:
-            logger.error(f"Error in _determine_node_type for {node_id}: {str(e)}")
+            logger.error("Error in _determine_node_type for %s: %s", node_id, e)
             # Return a default type instead of raising to avoid crashing
             return 'application-component'
 
-    def _determine_aws_resource_type(self, resource_type: str) -> str:
-        """Determine ArchiMate element type for AWS resources."""
-        # Compute resources
-        if resource_type in ['aws_instance', 'aws_launch_template', 'aws_autoscaling_group']:
-            return 'technology-node'
-        # Network resources
-        elif resource_type in ['aws_vpc', 'aws_subnet', 'aws_security_group', 'aws_route_table', 'aws_internet_gateway']:
-            return 'technology-node'
-        # Storage resources
-        elif resource_type in ['aws_s3_bucket', 'aws_dynamodb_table', 'aws_ebs_volume']:
-            return 'technology-artifact'
-        # Database resources
-        elif resource_type in ['aws_db_instance', 'aws_rds_cluster', 'aws_elasticache_cluster']:
-            return 'technology-node'
-        # Serverless resources
-        elif resource_type in ['aws_lambda_function', 'aws_step_function']:
-            return 'application-function'
-        # API resources
-        elif resource_type in ['aws_api_gateway', 'aws_api_gateway_rest_api']:
-            return 'application-interface'
-        # Service resources
-        elif resource_type in ['aws_cloudfront_distribution', 'aws_cloudwatch', 'aws_sns_topic', 'aws_sqs_queue']:
-            return 'technology-service'
-        # Default to technology-node
-        return 'technology-node'
-
-    def _determine_azure_resource_type(self, resource_type: str) -> str:
-        """Determine ArchiMate element type for Azure resources."""
-        # Compute resources
-        if resource_type in ['azurerm_virtual_machine', 'azurerm_linux_virtual_machine', 'azurerm_windows_virtual_machine', 'azurerm_virtual_machine_scale_set']:
-            return 'technology-node'
-        # Network resources
-        elif resource_type in ['azurerm_virtual_network', 'azurerm_subnet', 'azurerm_network_security_group', 'azurerm_route_table', 'azurerm_public_ip']:
-            return 'technology-node'
-        # Storage resources
-        elif resource_type in ['azurerm_storage_account', 'azurerm_storage_container', 'azurerm_storage_blob', 'azurerm_managed_disk']:
-            return 'technology-artifact'
-        # Database resources
-        elif resource_type in ['azurerm_sql_server', 'azurerm_sql_database', 'azurerm_cosmosdb_account', 'azurerm_mysql_server']:
-            return 'technology-node'
-        # Serverless resources
-        elif resource_type in ['azurerm_function_app', 'azurerm_logic_app_workflow']:
-            return 'application-function'
-        # API resources
-        elif resource_type in ['azurerm_api_management', 'azurerm_api_management_api']:
-            return 'application-interface'
-        # Service resources
-        elif resource_type in ['azurerm_application_gateway', 'azurerm_eventhub', 'azurerm_servicebus_namespace']:
-            return 'technology-service'
-        # Security resources
-        elif resource_type in ['azurerm_key_vault', 'azuread_application', 'azuread_service_principal']:
-            return 'technology-artifact'
-        # Default to technology-node
-        return 'technology-node'
-
-    def _determine_gcp_resource_type(self, resource_type: str) -> str:
-        """Determine ArchiMate element type for GCP resources."""
-        # Compute resources
-        if resource_type in ['google_compute_instance', 'google_compute_instance_template', 'google_compute_instance_group_manager']:
-            return 'technology-node'
-        # Network resources
-        elif resource_type in ['google_compute_network', 'google_compute_subnetwork', 'google_compute_firewall', 'google_compute_router', 'google_compute_global_address']:
-            return 'technology-node'
-        # Storage resources
-        elif resource_type in ['google_storage_bucket', 'google_bigquery_dataset', 'google_bigquery_table']:
-            return 'technology-artifact'
-        # Database resources
-        elif resource_type in ['google_sql_database_instance', 'google_sql_database', 'google_spanner_instance']:
-            return 'technology-node'
-        # Serverless resources
-        elif resource_type in ['google_cloudfunctions_function', 'google_cloud_run_service', 'google_cloud_scheduler_job']:
-            return 'application-function'
-        # API resources
-        elif resource_type in ['google_cloud_endpoints_service', 'google_api_gateway_api', 'google_api_gateway_api_config']:
-            return 'application-interface'
-        # Service resources
-        elif resource_type in ['google_pubsub_topic', 'google_pubsub_subscription', 'google_cloud_tasks_queue']:
-            return 'technology-service'
-        # Container resources
-        elif resource_type in ['google_container_cluster', 'google_container_node_pool']:
-            return 'technology-node'
-        # Security resources
-        elif resource_type in ['google_kms_key_ring', 'google_kms_crypto_key', 'google_service_account']:
-            return 'technology-artifact'
-        # Default to technology-node
+    def _determine_terraform_node_type(self, node_id: str, id_parts: Optional[Dict[str, NodeIdParts]] = None) -> str:
+        """Determine ArchiMate element type of a Terraform node from its ID."""
+        logger.debug("Processing Terraform node: %s", node_id)
+        
+        # Extract resource type from Terraform node ID
+        parts = self._node_id_parts(node_id, id_parts)
+        
+        # If it's a module, try to extract the actual resource type
+        if 'module.' in node_id:
+            logger.debug("Found module in node ID: %s", node_id)
+            for resource_type in parts.module_resource_types:
+                logger.debug("Extracted resource type from module: %s", resource_type)
+                # Check if we have a mapping for this resource type
+                if resource_type in self.terraform_resource_types:
+                    return self.terraform_resource_types[resource_type]
+            
+            # If we couldn't find a specific resource type but it's a module
+            if node_id.startswith('module.'):
+                logger.debug("No specific resource type found, treating as module: %s", node_id)
+                return 'application-component'
+        
+        if parts.resource_type:
+            resource_type = parts.resource_type
+            logger.debug("Extracted resource type: %s", resource_type)
+            
+            # One lookup covers the explicit mappings, the generic var and
+            # provider entries and the per-cloud resource types
+            element_type = self._resource_type_map.get(resource_type)
+            if element_type is not None:
+                logger.debug("Found mapping for resource type: %s -> %s", resource_type, element_type)
+                return element_type
+        
+        # If all else fails but it's a Terraform node, default to technology-node
+        logger.debug("No specific type found for Terraform node, defaulting to technology-node: %s", node_id)
         return 'technology-node'
 
-    def _determine_relationship_type(self, attributes: Dict[str, str], source_node: Dict[str, Any], target_node: Dict[str, Any], is_terraform: bool = False) -> str:
+    def _determine_relationship_type(self, attributes: Dict[str, str], source_node: DotNode, target_node: DotNode, is_terraform: bool = False,
+                                     id_parts: Optional[Dict[str, NodeIdParts]] = None) -> str:
         """Determine ArchiMate relationship type based on edge attributes."""
         # First check if the edge has an explicit type attribute
         if 'type' in attributes:
             rel_type = attributes['type'].lower()
-            for rule_type, rule in self.mapping_rules.get('mapping_rules', {}).get('relationships', {}).items():
-                if rule_type in rel_type:
-                    return rule['type']
-            return rel_type  # Return the type as is if no mapping found
+            # Return the type as is if no mapping found
+            return self._match_rule(self._edge_rules, self._edge_rule_cache, rel_type) or rel_type
         
         # Check label for relationship hints
         elif 'label' in attributes:
             label = attributes['label'].lower()
             
-            # Map common Terraform relationship labels to ArchiMate relationship types
-            if 'uses' in label or 'read' in label:
-                return 'serving-relationship'
-            elif 'creates' in label or 'manages' in label:
-                return 'assignment-relationship'
-            elif 'depends' in label:
-                return 'serving-relationship'
-            elif 'triggers' in label:
-                return 'triggering-relationship'
-            elif 'flows' in label or 'writes' in label:
-                return 'flow-relationship'
-            
-            # Check mapping rules
-            for rule_type, rule in self.mapping_rules.get('mapping_rules', {}).get('relationships', {}).items():
-                if rule_type in label:
-                    return rule['type']
+            # Map common Terraform relationship labels, then the mapping rules
+            rule_type = self._match_rule(self._label_rules, self._label_rule_cache, label)
+            if rule_type:
+                return rule_type
         
         # For Terraform graphs, determine relationship type based on node types
         if is_terraform:
-            source_id = source_node['id']
-            target_id = target_node['id']
-            source_attrs = source_node['attributes']
-            target_attrs = target_node['attributes']
+            source_id = source_node.id
+            target_id = target_node.id
+            source_attrs = source_node.attributes
+            target_attrs = target_node.attributes
             
             # Variable to resource relationship
             if 'var.' in source_id:
@@ -471,34 +595,36 @@ class ArchimateMapper:
             
             # Module relationships
             if 'module_path' in source_attrs or 'module_path' in target_attrs:
+                source_module = source_attrs.get('module_path')
+                target_module = target_attrs.get('module_path')
+                in_modules = source_module and target_module
                 # Resource within same module
-                if (source_attrs.get('module_path') and 
-                    target_attrs.get('module_path') and 
-                    source_attrs['module_path'] == target_attrs['module_path']):
+                if in_modules and source_module == target_module:
                     return 'composition-relationship'
                 # Resource to its module
-                elif 'module.' in source_id and not 'module_path' in target_attrs:
+                elif 'module.' in source_id and 'module_path' not in target_attrs:
                     return 'composition-relationship'
                 # Module to its resource
-                elif 'module.' in target_id and not 'module_path' in source_attrs:
+                elif 'module.' in target_id and 'module_path' not in source_attrs:
                     return 'composition-relationship'
                 # Cross-module relationships
-                elif (source_attrs.get('module_path') and 
-                      target_attrs.get('module_path') and 
-                      source_attrs['module_path'] != target_attrs['module_path']):
+                elif in_modules:
                     return 'serving-relationship'
             
             # Determine relationship based on cloud provider and resource types
-            source_provider = self._get_cloud_provider(source_node.get('display_id', source_id))
-            target_provider = self._get_cloud_provider(target_node.get('display_id', target_id))
+            source_display_id = source_node.display_id
+            target_display_id = target_node.display_id
+            # The parsed ids hold both the provider and the resource type, so
+            # each endpoint's parts are fetched once for both decisions
+            source_parts = self._node_id_parts(source_display_id, id_parts) if isinstance(source_display_id, str) else _NO_ID_PARTS
+            target_parts = self._node_id_parts(target_display_id, id_parts) if isinstance(target_display_id, str) else _NO_ID_PARTS
+            source_provider = source_parts.cloud_provider
+            target_provider = target_parts.cloud_provider
             
             # If both resources are from the same cloud provider
             if source_provider and source_provider == target_provider:
-                return self._determine_cloud_relationship(
-                    source_node.get('display_id', source_id), 
-                    target_node.get('display_id', target_id), 
-                    source_provider
-                )
+                resource_types = (source_provider, source_parts.resource_type, target_parts.resource_type)
+                return _CLOUD_RELATIONSHIPS.get(resource_types, 'flow-relationship')
             
             # Cross-cloud relationships (e.g., AWS to Azure)
             if source_provider and target_provider and source_provider != target_provider:
@@ -507,96 +633,11 @@ class ArchimateMapper:
         # Default to flow-relationship
         return 'flow-relationship'
         
-    def _get_cloud_provider(self, node_id: str) -> str:
-        """Determine the cloud provider from a node ID."""
-        # Strip any module prefixes to focus on the resource type
-        if isinstance(node_id, str):
-            # If we have a module reference, extract just the resource type
-            if 'module.' in node_id:
-                parts = node_id.split('.')
-                # Make sure we have enough parts before accessing
-                if len(parts) >= 2:
-                    # For something like module.vpc.google_compute_network.vpc
-                    # Try to extract the resource type (google_compute_network)
-                    for part in parts:
-                        if part.startswith(('aws_', 'azurerm_', 'azuread_', 'google_')):
-                            node_id = part
-                            break
-            
-            # Check for cloud provider prefixes
-            if 'aws_' in node_id:
-                return 'aws'
-            elif 'azurerm_' in node_id or 'azuread_' in node_id:
-                return 'azure'
-            elif 'google_' in node_id:
-                return 'gcp'
-        
-        return None
-        
-    def _determine_cloud_relationship(self, source_id: str, target_id: str, provider: str) -> str:
-        """Determine relationship type based on cloud provider and resource types."""
-        # Extract resource types
-        source_type = re.search(r'([a-zA-Z0-9_]+)\.([a-zA-Z0-9_]+)', source_id)
-        target_type = re.search(r'([a-zA-Z0-9_]+)\.([a-zA-Z0-9_]+)', target_id)
-        
-        if not source_type or not target_type:
-            return 'flow-relationship'
-            
-        source_resource = source_type.group(1)
-        target_resource = target_type.group(1)
-        
-        # AWS relationships
-        if provider == 'aws':
-            # Instance to network resources
-            if source_resource == 'aws_instance' and target_resource in ['aws_vpc', 'aws_subnet', 'aws_security_group']:
-                return 'serving-relationship'
-            # Network hierarchy
-            elif source_resource in ['aws_subnet', 'aws_security_group'] and target_resource == 'aws_vpc':
-                return 'composition-relationship'
-            # Database to storage
-            elif source_resource == 'aws_db_instance' and target_resource in ['aws_ebs_volume', 'aws_s3_bucket']:
-                return 'access-relationship'
-            # Lambda to services
-            elif source_resource == 'aws_lambda_function' and target_resource in ['aws_sqs_queue', 'aws_sns_topic', 'aws_dynamodb_table']:
-                return 'access-relationship'
-        
-        # Azure relationships
-        elif provider == 'azure':
-            # VM to network resources
-            if source_resource in ['azurerm_virtual_machine', 'azurerm_linux_virtual_machine', 'azurerm_windows_virtual_machine'] and target_resource in ['azurerm_virtual_network', 'azurerm_subnet', 'azurerm_network_security_group']:
-                return 'serving-relationship'
-            # Network hierarchy
-            elif source_resource == 'azurerm_subnet' and target_resource == 'azurerm_virtual_network':
-                return 'composition-relationship'
-            # Database to storage
-            elif source_resource in ['azurerm_sql_server', 'azurerm_cosmosdb_account'] and target_resource == 'azurerm_storage_account':
-                return 'access-relationship'
-            # Function to services
-            elif source_resource == 'azurerm_function_app' and target_resource in ['azurerm_storage_account', 'azurerm_servicebus_namespace', 'azurerm_eventhub']:
-                return 'access-relationship'
-        
-        # GCP relationships
-        elif provider == 'gcp':
-            # Instance to network resources
-            if source_resource == 'google_compute_instance' and target_resource in ['google_compute_network', 'google_compute_subnetwork', 'google_compute_firewall']:
-                return 'serving-relationship'
-            # Network hierarchy
-            elif source_resource == 'google_compute_subnetwork' and target_resource == 'google_compute_network':
-                return 'composition-relationship'
-            # Database to storage
-            elif source_resource == 'google_sql_database_instance' and target_resource == 'google_storage_bucket':
-                return 'access-relationship'
-            # Function to services
-            elif source_resource == 'google_cloudfunctions_function' and target_resource in ['google_pubsub_topic', 'google_storage_bucket', 'google_bigquery_dataset']:
-                return 'access-relationship'
-        
-        # Default to flow-relationship for other cases
-        return 'flow-relationship'
-
-    def _extract_properties(self, attributes: Dict[str, str]) -> List[Dict[str, str]]:
-        """Extract additional properties from attributes."""
-        return [
-            {'key': k, 'value': v}
-            for k, v in attributes.items()
-            if k not in ['label', 'type', 'description', 'shape']
-        ] 
\ No newline at end of file
+    def _node_id_parts(self, node_id: str, id_parts: Optional[Dict[str, NodeIdParts]]) -> NodeIdParts:
+        """Return the parsed node id, parsed once per graph for the node and its edges."""
+        if id_parts is None:
+            return _parse_node_id(node_id)
+        parts = id_parts.get(node_id)
+        if parts is None:
+            parts = id_parts[node_id] = _parse_node_id(node_id)
+        return parts
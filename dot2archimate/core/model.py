@@ -0,0 +1,82 @@
+from dataclasses import asdict, dataclass, is_dataclass
+from typing import Any, Dict, List, Union
+
+@dataclass(slots=True)
+class ArchimateElement:
+    """An ArchiMate element produced by the mapper."""
+    id: str
+    type: str
+    name: str
+    documentation: str
+    properties: Union[Dict[str, Any], List[Dict[str, str]]]
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ArchimateElement':
+        """Build an element from its dictionary form."""
+        return cls(data['id'], data['type'], data['name'], data['documentation'], data['properties'])
+
+@dataclass(slots=True)
+class ArchimateRelationship:
+    """An ArchiMate relationship produced by the mapper."""
+    id: str
+    type: str
+    source: str
+    target: str
+    name: str
+    properties: List[Dict[str, str]]
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ArchimateRelationship':
+        """Build a relationship from its dictionary form."""
+        return cls(data['id'], data['type'], data['source'], data['target'], data['name'], data['properties'])
+
+@dataclass(slots=True)
+class DotNode:
+    """A node parsed from a DOT graph."""
+    id: str
+    display_id: str
+    label: str
+    attributes: Dict[str, str]
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'DotNode':
+        """Build a node from its dictionary form, where display_id and label are optional."""
+        display_id = data.get('display_id', data['id'])
+        label = data['label'] if 'label' in data else data['attributes'].get('label', display_id)
+        return cls(data['id'], display_id, label, data['attributes'])
+
+@dataclass(slots=True)
+class DotEdge:
+    """An edge parsed from a DOT graph, referring to its nodes by DOT id."""
+    source: str
+    target: str
+    attributes: Dict[str, str]
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'DotEdge':
+        """Build an edge from its dictionary form."""
+        return cls(data['source'], data['target'], data['attributes'])
+
+def as_element(element: Union[ArchimateElement, Dict[str, Any]]) -> ArchimateElement:
+    """Return element as an ArchimateElement, converting it from a dict if needed."""
+    return element if type(element) is ArchimateElement else ArchimateElement.from_dict(element)
+
+def as_relationship(relationship: Union[ArchimateRelationship, Dict[str, Any]]) -> ArchimateRelationship:
+    """Return relationship as an ArchimateRelationship, converting it from a dict if needed."""
+    if type(relationship) is ArchimateRelationship:
+        return relationship
+    return ArchimateRelationship.from_dict(relationship)
+
+def as_node(node: Union[DotNode, Dict[str, Any]]) -> DotNode:
+    """Return node as a DotNode, converting it from a dict if needed."""
+    return node if type(node) is DotNode else DotNode.from_dict(node)
+
+def as_edge(edge: Union[DotEdge, Dict[str, Any]]) -> DotEdge:
+    """Return edge as a DotEdge, converting it from a dict if needed."""
+    return edge if type(edge) is DotEdge else DotEdge.from_dict(edge)
+
+def json_default(obj: Any) -> Any:
+    """json.dump default that writes model records as dicts and anything else as a string."""
+    if is_dataclass(obj):
+        return asdict(obj)
+    return str(obj)
@@ -1,34 +1,132 @@
-from typing import Dict, Any, List, Tuple
-import graphviz
+from typing import Dict, Any, Hashable, Iterable, List, Optional, Tuple
+from collections import OrderedDict
+import codecs
+import hashlib
 from logging import getLogger
+import os
 import re
+import sys
+import threading
+
+from dot2archimate.core.model import DotEdge, DotNode
 
 logger = getLogger(__name__)
 
+# Terraform graph node ids that are not actual resources
+_NON_RESOURCE_NODE_IDS = frozenset({'"true"', '"root"', '"]"', '"] (close)"'})
+
+# Number of recent DOT inputs whose parse results are kept, shared by all parsers
+PARSE_CACHE_SIZE = 32
+
+# DOT content, attribute and edge patterns, compiled once
+_COMMENT_RE = re.compile(r'//.*?\n|/\*.*?\*/', re.DOTALL)
+_GRAPH_ATTR_RE = re.compile(r'(?:digraph|graph)\s+(?:\w+\s+)?{([^{]*?)(?:subgraph|node|edge|"|\w+\s*\[|$)', re.DOTALL)
+_SUBGRAPH_RE = re.compile(r'subgraph\s+"?(\w+)"?\s+{(.*?)}', re.DOTALL)
+_TERRAFORM_NODE_RE = re.compile(r'"(\[root\][^"]+)"\s*\[(.*?)\]')
+_TERRAFORM_EDGE_RE = re.compile(r'"(\[root\][^"]+)"\s*->\s*"(\[root\][^"]+)"')
+_EDGE_RE = re.compile(
+    r'(?:"([^"]+)"|([a-zA-Z_][a-zA-Z0-9_]*))\s*->\s*(?:"([^"]+)"|([a-zA-Z_][a-zA-Z0-9_]*))(?:\s*\[([^\]]*)\])?'
+)
+# A line holding only a node definition; lines that declare a graph or hold
+# an edge are skipped. [^\S\n] is whitespace that stays on the line.
+_NODE_LINE_RE = re.compile(
+    r'^[^\S\n]*(?!digraph|graph|[^\n]*->)(?:"([^"\n]+)"|([a-zA-Z_][a-zA-Z0-9_]*))'
+    r'(?:[^\S\n]*\[([^\]\n]*)\])?[^\S\n]*;?[^\S\n]*$',
+    re.MULTILINE
+)
+_GRAPH_ATTR_SEPARATOR_RE = re.compile(r'[;\n]')
+_ATTRIBUTE_RE = re.compile(r'(\w+)\s*=\s*(?:"([^"]*)"|\w+)')
+
+# Parse results keyed by a digest of the DOT content or, for files, by path,
+# modification time and size, least recently used first. Only the digest is
+# kept, not the content, and callers only ever get copies of the results.
+_parse_cache: 'OrderedDict[Hashable, Dict[str, Any]]' = OrderedDict()
+_parse_cache_lock = threading.Lock()
+
+def _cached_result(key: Hashable) -> Optional[Dict[str, Any]]:
+    """Return the cached parse result for key, or None."""
+    with _parse_cache_lock:
+        result = _parse_cache.get(key)
+        if result is not None:
+            _parse_cache.move_to_end(key)
+        return result
+
+def _cache_result(key: Hashable, result: Dict[str, Any]) -> None:
+    """Cache a parse result, evicting the least recently used beyond PARSE_CACHE_SIZE."""
+    with _parse_cache_lock:
+        _parse_cache[key] = result
+        _parse_cache.move_to_end(key)
+        while len(_parse_cache) > PARSE_CACHE_SIZE:
+            _parse_cache.popitem(last=False)
+
+def _copy_result(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Return a copy of a parse result that the caller may modify freely."""
+    return {
+        'nodes': {node_id: DotNode(node.id, node.display_id, node.label, dict(node.attributes))
+                  for node_id, node in result['nodes'].items()},
+        'edges': [DotEdge(edge.source, edge.target, dict(edge.attributes)) for edge in result['edges']],
+        'graph_attrs': dict(result['graph_attrs']),
+        'subgraphs': [dict(subgraph) for subgraph in result['subgraphs']],
+        'is_terraform': result['is_terraform']
+    }
+
 class DotParser:
-    def __init__(self):
-        self.graph = None
+    # Parsers hold no per-input state, so one instance can serve many callers
+
+    @staticmethod
+    def graphviz_source(dot_string: str):
+        """Return a graphviz.Source for a DOT string; graphviz is only imported here."""
+        import graphviz
+        return graphviz.Source(dot_string)
 
     def parse_string(self, dot_string: str) -> Dict[str, Any]:
         """Parse a DOT string into an internal representation."""
         try:
-            # Create a temporary file to use graphviz's parsing
-            self.graph = graphviz.Source(dot_string)
-            parsed_data = self._parse_dot_content(dot_string)
-            return parsed_data
+            return _copy_result(self._parse_shared(dot_string))
         except Exception as e:
-            logger.error(f"Failed to parse DOT string: {e}")
+            logger.error("Failed to parse DOT string: %s", e)
             raise ValueError(f"Invalid DOT format: {e}")
 
     def parse_file(self, file_path: str) -> Dict[str, Any]:
         """Parse a DOT file into an internal representation."""
         try:
-            with open(file_path, 'r') as f:
-                return self.parse_string(f.read())
+            # An unchanged file is recognised without reading it again
+            st = os.stat(file_path)
+            file_key = (os.path.abspath(file_path), st.st_mtime_ns, st.st_size)
+            parsed_data = _cached_result(file_key)
+            if parsed_data is None:
+                with open(file_path, 'r') as f:
+                    parsed_data = self._parse_shared(f.read())
+                _cache_result(file_key, parsed_data)
+            return _copy_result(parsed_data)
         except Exception as e:
-            logger.error(f"Failed to parse DOT file {file_path}: {e}")
+            logger.error("Failed to parse DOT file %s: %s", file_path, e)
             raise ValueError(f"Failed to parse DOT file: {e}")
 
+    def parse_stream(self, chunks: Iterable[bytes], encoding: str = 'utf-8') -> Dict[str, Any]:
+        """Parse DOT content delivered as an iterable of byte chunks."""
+        try:
+            # Decode chunk by chunk so the raw bytes are released as we go
+            decoder = codecs.getincrementaldecoder(encoding)()
+            parts = [decoder.decode(chunk) for chunk in chunks]
+            parts.append(decoder.decode(b'', final=True))
+        except UnicodeDecodeError as e:
+            logger.error("Failed to decode DOT stream: %s", e)
+            raise ValueError(f"Invalid DOT encoding: {e}")
+        return self.parse_string(''.join(parts))
+
+    def _parse_shared(self, dot_string: str) -> Dict[str, Any]:
+        """Parse a DOT string, reusing the cached result for content seen before.
+
+        The result may be shared with other callers and must not be modified.
+        """
+        key = hashlib.blake2b(dot_string.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+        parsed_data = _cached_result(key)
+        if parsed_data is None:
+            parsed_data = self._parse_dot_content(dot_string)
+            _cache_result(key, parsed_data)
+        return parsed_data
+
     def _parse_dot_content(self, content: str) -> Dict[str, Any]:
         """Parse DOT content using regex to extract nodes and edges."""
         nodes = {}
@@ -36,24 +134,23 @@ class DotParser:
         graph_attrs = {}
         node_ids = set()  # Keep track of node IDs to avoid duplicates
         subgraphs = []
+        pending_edges = []  # (source, target, attributes) before node filtering
 
         # Remove comments and normalize whitespace
-        content = re.sub(r'//.*?\n|/\*.*?\*/', '', content, flags=re.DOTALL)
+        content = _COMMENT_RE.sub('', content)
         
         # Check if this is a Terraform graph
         is_terraform = 'provider[' in content or '[root]' in content
         
         # Extract graph attributes
-        graph_attr_pattern = r'(?:digraph|graph)\s+(?:\w+\s+)?{([^{]*?)(?:subgraph|node|edge|"|\w+\s*\[|$)'
-        graph_attr_match = re.search(graph_attr_pattern, content, re.DOTALL)
+        graph_attr_match = _GRAPH_ATTR_RE.search(content)
         if graph_attr_match:
             attr_text = graph_attr_match.group(1).strip()
             attrs = self._parse_graph_attributes(attr_text)
             graph_attrs.update(attrs)
 
         # Extract subgraphs
-        subgraph_pattern = r'subgraph\s+"?(\w+)"?\s+{(.*?)}'
-        for match in re.finditer(subgraph_pattern, content, re.DOTALL):
+        for match in _SUBGRAPH_RE.finditer(content):
             subgraph_name = match.group(1)
             subgraph_content = match.group(2)
             subgraphs.append({
@@ -64,13 +161,12 @@ class DotParser:
         # For Terraform graphs, extract nodes with special handling
         if is_terraform:
             # Extract nodes with attributes - Terraform style
-            terraform_node_pattern = r'"(\[root\][^"]+)"\s*\[(.*?)\]'
-            for match in re.finditer(terraform_node_pattern, content):
+            for match in _TERRAFORM_NODE_RE.finditer(content):
                 node_id = match.group(1)
                 attrs_str = match.group(2)
                 
                 # Skip nodes that are not actual resources
-                if node_id in ['"true"', '"root"', '"]"', '"] (close)"'] or '[label =' in node_id or ', shape =' in node_id:
+                if node_id in _NON_RESOURCE_NODE_IDS or '[label =' in node_id or ', shape =' in node_id:
                     continue
                 
                 # Parse attributes
@@ -93,22 +189,22 @@ class DotParser:
                 # For module resources like "module.vpc.google_compute_network.vpc"
                 # Extract just the resource type and name
                 if 'module.' in display_id:
-                    logger.debug(f"Processing module node: {display_id}")
+                    logger.debug("Processing module node: %s", display_id)
                     # Get all parts of the module path
                     parts = display_id.split('.')
-                    logger.debug(f"Module parts: {parts}")
+                    logger.debug("Module parts: %s", parts)
                     
                     # Make sure we have at least 3 parts (module.name.resource)
                     if len(parts) >= 3:
                         # Store original module path as a string
                         module_parts = parts[:-2] if len(parts) > 2 else [parts[0]]
                         module_path = '.'.join(module_parts)
-                        logger.debug(f"Module path: {module_path}")
+                        logger.debug("Module path: %s", module_path)
                         
                         # Get the resource part (last two components)
                         resource_parts = parts[-2:] if len(parts) >= 2 else [display_id]
                         resource_part = '.'.join(resource_parts)
-                        logger.debug(f"Resource part: {resource_part}")
+                        logger.debug("Resource part: %s", resource_part)
                         
                         # Add module information to attributes
                         attrs['module_path'] = module_path
@@ -120,14 +216,11 @@ class DotParser:
                         if label == node_id:  # If label is the same as node_id, update it
                             label = resource_part
                 
-                logger.debug(f"Node attributes: {attrs}")
-                nodes[node_id] = {
-                    'id': node_id,
-                    'display_id': display_id,
-                    'label': label,
-                    'attributes': attrs
-                }
+                logger.debug("Node attributes: %s", attrs)
+                nodes[node_id] = DotNode(node_id, display_id, label, attrs)
                 node_ids.add(node_id)
+
+            pending_edges.extend((match.group(1), match.group(2), '') for match in _TERRAFORM_EDGE_RE.finditer(content))
         else:
             # Extract nodes with attributes - standard DOT style
             # DOT keywords to exclude
@@ -137,119 +230,76 @@ class DotParser:
             # This ensures we only get actual nodes, not syntax elements
             
             # Step 1: Collect all node IDs from edges (they're definitely nodes)
+            # and the edges themselves in one scan. The node IDs come from the
+            # bare "source -> target" part of each match, which resumes right
+            # after the target; the edges also consume a trailing [attributes]
+            # list, so each keeps its own resume position.
             edge_node_ids = set()
-            edge_preview_pattern = r'(?:"([^"]+)"|([a-zA-Z_][a-zA-Z0-9_]*))\s*->\s*(?:"([^"]+)"|([a-zA-Z_][a-zA-Z0-9_]*))'
-            for edge_match in re.finditer(edge_preview_pattern, content):
-                for i in [1, 2, 3, 4]:
-                    node_id = edge_match.group(i)
-                    if node_id and node_id.lower() not in dot_keywords:
-                        edge_node_ids.add(node_id)
+            preview_pos = edge_pos = pos = 0
+            while True:
+                edge_match = _EDGE_RE.search(content, pos)
+                if edge_match is None:
+                    break
+                start = edge_match.start()
+                if start >= preview_pos:
+                    for i in [1, 2, 3, 4]:
+                        node_id = edge_match.group(i)
+                        if node_id and node_id.lower() not in dot_keywords:
+                            edge_node_ids.add(node_id)
+                    quoted_target = edge_match.group(3) is not None
+                    preview_pos = edge_match.end(3) + 1 if quoted_target else edge_match.end(4)
+                if start >= edge_pos:
+                    pending_edges.append((
+                        edge_match.group(1) or edge_match.group(2),
+                        edge_match.group(3) or edge_match.group(4),
+                        edge_match.group(5) or ''
+                    ))
+                    edge_pos = edge_match.end()
+                pos = max(start + 1, min(preview_pos, edge_pos))
             
             # Step 2: Find standalone node definitions
             # Pattern: node_id [attributes] where node_id is NOT part of an edge
-            # We'll match: identifier followed by [attributes] that's NOT preceded by ->
-            # More precise: match lines that look like node definitions
-            lines = content.split('\n')
-            for line in lines:
-                line = line.strip()
-                # Skip empty lines, comments, and graph declarations
-                if not line or line.startswith('//') or line.startswith('/*') or line.startswith('digraph') or line.startswith('graph') or line == '{' or line == '}':
+            # Lines are matched in place rather than split out of the content
+            for node_match in _NODE_LINE_RE.finditer(content):
+                node_id = node_match.group(1) if node_match.group(1) else node_match.group(2)
+                attrs_str = node_match.group(3) if node_match.group(3) else ""
+                
+                if not node_id:
                     continue
                 
-                # Skip edge definitions (they're handled separately)
-                if '->' in line:
+                # Skip keywords
+                if node_id.lower() in dot_keywords:
                     continue
                 
-                # Match node definition: node_id [attributes] or "node_id" [attributes]
-                # Pattern: start of line, optional whitespace, node_id (quoted or unquoted), optional [attributes], optional semicolon
-                node_match = re.match(r'^\s*(?:"([^"]+)"|([a-zA-Z_][a-zA-Z0-9_]*))(?:\s*\[([^\]]*)\])?\s*;?\s*$', line)
-                if node_match:
-                    node_id = node_match.group(1) if node_match.group(1) else node_match.group(2)
-                    attrs_str = node_match.group(3) if node_match.group(3) else ""
-                    
-                    if not node_id:
-                        continue
-                    
-                    # Skip keywords
-                    if node_id.lower() in dot_keywords:
-                        continue
-                    
-                    # Parse attributes
-                    attrs = self._parse_attributes(attrs_str)
-                    
-                    # Use label if available, otherwise use node_id
-                    label = attrs.get('label', node_id).strip('"')
-                    
-                    # Skip if already processed
-                    if node_id in nodes:
-                        continue
-                    
-                    nodes[node_id] = {
-                        'id': node_id,
-                        'display_id': node_id,
-                        'label': label,
-                        'attributes': attrs
-                    }
-                    node_ids.add(node_id)
+                # Parse attributes
+                attrs = self._parse_attributes(attrs_str)
+                
+                # Use label if available, otherwise use node_id
+                label = attrs.get('label', node_id).strip('"')
+                
+                # Skip if already processed
+                if node_id in nodes:
+                    continue
+                
+                nodes[node_id] = DotNode(node_id, node_id, label, attrs)
+                node_ids.add(node_id)
             
             # Step 3: Add nodes from edges that weren't found as standalone definitions
             for node_id in edge_node_ids:
                 if node_id not in nodes:
-                    nodes[node_id] = {
-                        'id': node_id,
-                        'display_id': node_id,
-                        'label': node_id,
-                        'attributes': {}
-                    }
+                    nodes[node_id] = DotNode(node_id, node_id, node_id, {})
                     node_ids.add(node_id)
 
-        # Extract edges
-        if is_terraform:
-            # Terraform-specific edge extraction
-            edge_pattern = r'"(\[root\][^"]+)"\s*->\s*"(\[root\][^"]+)"'
-            edge_matches = re.finditer(edge_pattern, content)
+        # Keep the edges whose endpoints are both known nodes
+        for source_id, target_id, attrs_str in pending_edges:
+            if not source_id or not target_id:
+                continue
             
-            for match in edge_matches:
-                source_id = match.group(1)
-                target_id = match.group(2)
-                
-                # Skip edges with non-existent nodes
-                if source_id not in nodes or target_id not in nodes:
-                    continue
-                
-                edges.append({
-                    'source': source_id,
-                    'target': target_id,
-                    'attributes': {}
-                })
-        else:
-            # Standard DOT edge extraction
-            # Match: source -> target [attributes]
-            # Handle both quoted and unquoted node IDs
-            edge_pattern = r'(?:"([^"]+)"|([a-zA-Z_][a-zA-Z0-9_]*))\s*->\s*(?:"([^"]+)"|([a-zA-Z_][a-zA-Z0-9_]*))(?:\s*\[([^\]]*)\])?'
-            edge_matches = re.finditer(edge_pattern, content)
+            # Skip edges with non-existent nodes
+            if source_id not in nodes or target_id not in nodes:
+                continue
             
-            for match in edge_matches:
-                # Get source and target from either quoted or unquoted match
-                source_id = match.group(1) if match.group(1) else match.group(2)
-                target_id = match.group(3) if match.group(3) else match.group(4)
-                attrs_str = match.group(5) if match.group(5) else ""
-                
-                if not source_id or not target_id:
-                    continue
-                
-                # Skip edges with non-existent nodes
-                if source_id not in nodes or target_id not in nodes:
-                    continue
-                
-                # Parse attributes
-                attrs = self._parse_attributes(attrs_str)
-                
-                edges.append({
-                    'source': source_id,
-                    'target': target_id,
-                    'attributes': attrs
-                })
+            edges.append(DotEdge(source_id, target_id, self._parse_attributes(attrs_str)))
 
         # Check for invalid syntax
         if not (nodes or edges) and 'digraph' in content:
@@ -267,7 +317,7 @@ class DotParser:
         """Parse graph attribute string into dictionary."""
         attrs = {}
         # Split by newline or semicolon
-        lines = re.split(r'[;\n]', attr_string)
+        lines = _GRAPH_ATTR_SEPARATOR_RE.split(attr_string)
         for line in lines:
             if '=' in line:
                 key, value = line.split('=', 1)
@@ -281,7 +331,8 @@ class DotParser:
         """Parse attribute string into dictionary."""
         attrs = {}
         # Split by comma, handling potential nested structures
-        parts = re.findall(r'(\w+)\s*=\s*(?:"([^"]*)"|\w+)', attr_string)
+        parts = _ATTRIBUTE_RE.findall(attr_string)
         for key, value in parts:
-            attrs[key] = value or key
+            # Nodes share a few attribute names; interning stores each once
+            attrs[sys.intern(key)] = value or key
         return attrs 
\ No newline at end of file
@@ -0,0 +1,11 @@
+import logging
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+def setup(level: int = logging.INFO) -> None:
+    """Configure logging for the dot2archimate entry points.
+
+    Safe to call from every entry module: the root handler is only installed
+    the first time, so records are never emitted twice.
+    """
+    logging.basicConfig(level=level, format=LOG_FORMAT)
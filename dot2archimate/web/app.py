@@ -4,21 +4,18 @@ import logging
 import tempfile
 import json
 import uuid
-import yaml
 import secrets
 import time
 from datetime import timedelta
 from pathlib import Path
 
-from dot2archimate.core.parser import DotParser
-from dot2archimate.core.mapper import ArchimateMapper
-from dot2archimate.core.generator import ArchimateXMLGenerator
+from dot2archimate import logging_config
+from dot2archimate.config import yaml_compat
+from dot2archimate.core.factory import get_pipeline
+from dot2archimate.core.model import json_default
 
 # Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+logging_config.setup()
 logger = logging.getLogger(__name__)
 
 app = Flask(__name__, 
@@ -66,7 +63,7 @@ def save_session_data(session_id: str, data: dict):
         
         # Write file with explicit flush to ensure it's written
         with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(save_data, f, default=str)  # default=str handles any non-serializable types
+            json.dump(save_data, f, default=json_default)  # Model records are stored as dicts, other types as strings
             f.flush()
             os.fsync(f.fileno())  # Force write to disk
         
@@ -139,9 +136,7 @@ def cleanup_expired_sessions():
             logger.warning(f"Error cleaning up session file {file_path}: {e}")
 
 # Initialize components
-parser = DotParser()
-mapper = ArchimateMapper("config.yaml")
-generator = ArchimateXMLGenerator()
+parser, mapper, generator = get_pipeline("config.yaml")
 
 # Load legal configuration
 legal_config_path = os.path.join(os.path.dirname(__file__), 'config', 'legal_settings.yaml')
@@ -152,7 +147,7 @@ legal_config = {}
 if os.path.exists(legal_config_path):
     try:
         with open(legal_config_path, 'r', encoding='utf-8') as file:
-            legal_config = yaml.safe_load(file)
+            legal_config = yaml_compat.load(file)
         logger.info("Loaded legal configuration from %s", legal_config_path)
     except Exception as e:
         logger.error("Error loading legal configuration: %s", str(e))
@@ -163,7 +158,7 @@ elif os.path.exists(template_path):
     logger.info("Using template as reference (not for production use)")
     try:
         with open(template_path, 'r', encoding='utf-8') as file:
-            legal_config = yaml.safe_load(file)
+            legal_config = yaml_compat.load(file)
     except Exception as e:
         logger.error("Error loading template configuration: %s", str(e))
 else:
@@ -189,7 +184,7 @@ def convert():
             data = request.get_json()
             if 'archimate_data' in data:
                 # Generate XML from the provided data
-                xml_output = generator.generate_xml(data['archimate_data'])
+                xml_output = generator.generate_xml(data['archimate_data'], pretty_print=True)
                 
                 # Return the XML as a downloadable file
                 response = Response(xml_output, mimetype='application/xml')
@@ -216,7 +211,7 @@ def convert():
         # Process the conversion
         graph_data = parser.parse_string(dot_string)
         archimate_data = mapper.map_to_archimate(graph_data)
-        xml_output = generator.generate_xml(archimate_data)
+        xml_output = generator.generate_xml(archimate_data, pretty_print=True)
         
         # Default behavior: always visualize (unless explicitly requesting download)
         if request.form.get('download_only') != 'true':
@@ -481,7 +476,7 @@ def convert_example(filename):
         # This ensures consistent mapping and coloring
         graph_data = parser.parse_string(dot_content)
         archimate_data = mapper.map_to_archimate(graph_data)
-        xml_output = generator.generate_xml(archimate_data)
+        xml_output = generator.generate_xml(archimate_data, pretty_print=True)
         
         # Generate session ID and store data in file-based storage
         # Use the same pattern as the regular convert route
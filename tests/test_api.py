@@ -0,0 +1,52 @@
+import os
+import sys
+
+from fastapi.testclient import TestClient
+
+# Add parent directory to path to allow imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dot2archimate.api.app import app
+
+client = TestClient(app)
+
+DOT_STRING = '''
+digraph G {
+    node1 [label="Application 1", type="application"];
+    node2 [label="Application 2", type="application"];
+    node1 -> node2 [label="uses"];
+}
+'''
+
+def test_convert_text():
+    """Test converting DOT text through the API."""
+    response = client.post("/convert/text", data={"dot_content": DOT_STRING})
+    assert response.status_code == 200
+    assert response.text.startswith('<?xml')
+    assert 'name="Application 1"' in response.text
+    assert 'serving-relationship' in response.text
+
+def test_convert_file():
+    """Test converting an uploaded DOT file through the API."""
+    response = client.post("/convert/file", files={"file": ("test.dot", DOT_STRING.encode('utf-8'))})
+    assert response.status_code == 200
+    assert 'name="Application 2"' in response.text
+
+def test_convert_invalid():
+    """Test that invalid DOT content is rejected."""
+    response = client.post("/convert/text", data={"dot_content": "digraph G { invalid syntax }"})
+    assert response.status_code == 400
+
+def test_startup_warm_up():
+    """Test that the app starts and serves requests after warming up."""
+    with TestClient(app) as warm_client:
+        response = warm_client.post("/convert/text", data={"dot_content": DOT_STRING})
+    assert response.status_code == 200
+
+def test_convert_generation_error_is_not_streamed():
+    """Test that a failure while writing the XML is reported with an error status."""
+    # Control characters can't be written to XML
+    dot = 'digraph G {\n    a [label="A"];\n    b [label="bad\x01"];\n    a -> b;\n}\n'
+    response = client.post("/convert/text", data={"dot_content": dot})
+    assert response.status_code == 400
+    assert 'XML compatible' in response.json()['detail']
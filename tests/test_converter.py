@@ -0,0 +1,87 @@
+import os
+import sys
+
+# Add parent directory to path to allow imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dot2archimate.core import converter as converter_module
+from dot2archimate.core.converter import Converter
+
+DOT = 'digraph G {\n  app [label="App"];\n  db [label="DB"];\n  app -> db;\n}\n'
+
+def test_convert_reuses_cached_output(tmp_path):
+    """Test that converting unchanged input is served from the cache."""
+    input_file = tmp_path / "graph.dot"
+    input_file.write_text(DOT)
+    cache_dir = tmp_path / "cache"
+    converter = Converter(cache_dir=cache_dir)
+
+    converter.convert(str(input_file), str(tmp_path / "first.xml"))
+    assert len(list(cache_dir.glob('*.xml'))) == 1
+
+    converter.convert(str(input_file), str(tmp_path / "second.xml"))
+    # Element ids are random, so identical output means the cache was used
+    assert (tmp_path / "second.xml").read_bytes() == (tmp_path / "first.xml").read_bytes()
+
+def test_convert_without_cache(tmp_path):
+    """Test that the cache can be disabled."""
+    input_file = tmp_path / "graph.dot"
+    input_file.write_text(DOT)
+    cache_dir = tmp_path / "cache"
+
+    Converter(use_cache=False, cache_dir=cache_dir).convert(str(input_file), str(tmp_path / "out.xml"))
+    assert b'App' in (tmp_path / "out.xml").read_bytes()
+    assert not cache_dir.exists()
+
+def test_cache_key_covers_config_content_and_version(tmp_path, monkeypatch):
+    """Test that cached output is not reused across configs or package versions."""
+    input_file = tmp_path / "graph.dot"
+    input_file.write_text(DOT)
+    first_config = tmp_path / "first.yaml"
+    second_config = tmp_path / "second.yaml"
+    first_config.write_text("mapping_rules:\n  nodes: {}\n")
+    second_config.write_text("mapping_rules:\n  relationships: {}\n")
+    # Same modification time for both configs
+    os.utime(second_config, ns=(first_config.stat().st_atime_ns, first_config.stat().st_mtime_ns))
+
+    first = Converter(str(first_config), cache_dir=tmp_path / "cache")
+    second = Converter(str(second_config), cache_dir=tmp_path / "cache")
+    default = Converter(cache_dir=tmp_path / "cache")
+    dot_bytes = input_file.read_bytes()
+    paths = {first._cache_path(dot_bytes), second._cache_path(dot_bytes), default._cache_path(dot_bytes)}
+    assert len(paths) == 3
+
+    monkeypatch.setattr(converter_module, '__version__', '0.0.0-test')
+    assert default._cache_path(dot_bytes) not in paths
+
+def test_cache_is_pruned_to_most_recent_entries(tmp_path, monkeypatch):
+    """Test that the cache directory keeps only the most recently used entries."""
+    monkeypatch.setattr(converter_module, 'CACHE_MAX_ENTRIES', 2)
+    cache_dir = tmp_path / "cache"
+    converter = Converter(cache_dir=cache_dir)
+
+    for i in range(4):
+        input_file = tmp_path / f"graph{i}.dot"
+        input_file.write_text(DOT.replace('App', f'App {i}'))
+        converter.convert(str(input_file), str(tmp_path / f"out{i}.xml"))
+        cache_path = converter._cache_path(input_file.read_bytes())
+        # Distinct, increasing modification times
+        os.utime(cache_path, ns=(i * 10**9, i * 10**9))
+
+    kept = {path.name for path in cache_dir.glob('*.xml')}
+    expected = {converter._cache_path((tmp_path / f"graph{i}.dot").read_bytes()).name for i in (2, 3)}
+    assert kept == expected
+
+def test_failed_cache_write_leaves_no_temp_file(tmp_path, monkeypatch):
+    """Test that a cache write failure removes its temporary file."""
+    input_file = tmp_path / "graph.dot"
+    input_file.write_text(DOT)
+    cache_dir = tmp_path / "cache"
+
+    def fail_replace(src, dst):
+        raise OSError("disk full")
+    monkeypatch.setattr(converter_module.os, 'replace', fail_replace)
+    Converter(cache_dir=cache_dir).convert(str(input_file), str(tmp_path / "out.xml"))
+
+    assert (tmp_path / "out.xml").exists()
+    assert list(cache_dir.iterdir()) == []
@@ -0,0 +1,119 @@
+import io
+import os
+import sys
+
+from lxml import etree
+
+# Add parent directory to path to allow imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dot2archimate.core.generator import ArchimateXMLGenerator
+from dot2archimate.core.mapper import ArchimateMapper
+
+ARCHIMATE_DATA = {
+    'elements': [
+        {
+            'id': 'id-1',
+            'type': 'application-component',
+            'name': 'Web & API',
+            'documentation': 'Serves <requests>',
+            'properties': {'shape': 'box', 'tier': 1}
+        },
+        {
+            'id': 'id-2',
+            'type': 'technology-node',
+            'name': 'Database',
+            'documentation': '',
+            'properties': {}
+        }
+    ],
+    'relationships': [
+        {
+            'id': 'id-3',
+            'type': 'serving-relationship',
+            'source': 'id-1',
+            'target': 'id-2',
+            'name': 'uses',
+            'properties': [{'key': 'color', 'value': 'red'}]
+        }
+    ]
+}
+
+def _canonical(xml):
+    """Parse XML and serialize it canonically, ignoring formatting whitespace."""
+    if isinstance(xml, str):
+        xml = xml.encode('utf-8')
+    parser = etree.XMLParser(remove_blank_text=True)
+    return etree.tostring(etree.fromstring(xml, parser), method='c14n')
+
+def test_generate_xml():
+    """Test generating a complete ArchiMate document."""
+    generator = ArchimateXMLGenerator()
+    root = etree.fromstring(generator.generate_xml(ARCHIMATE_DATA).encode('utf-8'))
+
+    ns = {'archimate': 'http://www.opengroup.org/xsd/archimate/3.0/'}
+    elements = root.findall('archimate:elements/*', ns)
+    assert [e.get('name') for e in elements] == ['Web & API', 'Database']
+    assert elements[0].findtext('archimate:documentation', namespaces=ns) == 'Serves <requests>'
+    properties = elements[0].findall('archimate:properties/archimate:property', ns)
+    assert [(p.get('key'), p.get('value')) for p in properties] == [('shape', 'box'), ('tier', '1')]
+
+    relationship = root.find('archimate:relationships/archimate:serving-relationship', ns)
+    assert relationship.get('source') == 'id-1'
+    assert relationship.get('target') == 'id-2'
+    assert relationship.get('name') == 'uses'
+
+def _write_xml(generator, archimate_data):
+    """Return the document written by write_xml."""
+    output = io.BytesIO()
+    generator.write_xml(archimate_data, output)
+    return output.getvalue()
+
+def test_write_xml_matches_generate_xml():
+    """Test that the streamed document is equivalent to the buffered one."""
+    generator = ArchimateXMLGenerator()
+    xml = _write_xml(generator, ARCHIMATE_DATA)
+
+    assert xml.startswith(b'<?xml version="1.0" encoding="UTF-8"?>\n')
+    assert _canonical(xml) == _canonical(generator.generate_xml(ARCHIMATE_DATA))
+
+def test_namespaces_declared_on_root_only():
+    """Test that all generated elements reuse the root's namespace declarations."""
+    generator = ArchimateXMLGenerator()
+    data = {
+        'elements': [dict(ARCHIMATE_DATA['elements'][0], id=f'id-{i}') for i in range(50)],
+        'relationships': ARCHIMATE_DATA['relationships']
+    }
+
+    for xml in (generator.generate_xml_bytes(data), _write_xml(generator, data)):
+        assert xml.count(b'xmlns:') == len(generator.nsmap)
+        root = etree.fromstring(xml)
+        assert all(elem.nsmap == root.nsmap for elem in root.iter())
+
+def test_convert_streams_mapped_graph():
+    """Test mapping and writing a parsed graph in a single pass."""
+    graph_data = {
+        'nodes': {
+            'a': {'id': 'a', 'attributes': {'label': 'A'}},
+            'b': {'id': 'b', 'attributes': {'label': 'B', 'shape': 'ellipse'}}
+        },
+        'edges': [{'source': 'a', 'target': 'b', 'attributes': {'label': 'uses'}}]
+    }
+    output = io.BytesIO()
+    ArchimateXMLGenerator().convert(ArchimateMapper(), graph_data, output)
+
+    root = etree.fromstring(output.getvalue())
+    ns = {'archimate': 'http://www.opengroup.org/xsd/archimate/3.0/'}
+    ids = {e.get('name'): e.get('id') for e in root.findall('archimate:elements/*', ns)}
+    relationship = root.find('archimate:relationships/archimate:serving-relationship', ns)
+    assert (relationship.get('source'), relationship.get('target')) == (ids['A'], ids['B'])
+
+def test_pretty_print_is_opt_in():
+    """Test that XML is only indented when requested."""
+    generator = ArchimateXMLGenerator()
+    compact = generator.generate_xml(ARCHIMATE_DATA)
+    pretty = generator.generate_xml(ARCHIMATE_DATA, pretty_print=True)
+
+    assert '\n  <archimate:elements>' not in compact
+    assert '\n  <archimate:elements>' in pretty
+    assert _canonical(compact) == _canonical(pretty)
@@ -0,0 +1,42 @@
+import os
+import subprocess
+import sys
+
+# Add parent directory to path to allow imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def _run(script):
+    """Run a script in a fresh interpreter and return its result."""
+    # pytest attaches its own capture handlers to the root logger
+    return subprocess.run([sys.executable, '-c', script], cwd=PROJECT_ROOT,
+                          capture_output=True, text=True)
+
+def test_entry_modules_do_not_configure_logging_on_import():
+    """Test that importing the entry modules leaves the root logger untouched."""
+    result = _run(
+        "import logging\n"
+        "root = logging.getLogger()\n"
+        "handlers, level = list(root.handlers), root.level\n"
+        "import dot2archimate.cli.commands\n"
+        "import dot2archimate.cli.legal_config\n"
+        "import dot2archimate.api.app\n"
+        "assert root.handlers == handlers, root.handlers\n"
+        "assert root.level == level, root.level\n"
+    )
+    assert result.returncode == 0, result.stderr
+
+def test_entry_points_install_single_handler():
+    """Test that the entry points configure logging only once."""
+    result = _run(
+        "import logging\n"
+        "from click.testing import CliRunner\n"
+        "from dot2archimate.cli.commands import cli\n"
+        "from dot2archimate import logging_config\n"
+        "logging_config.setup()\n"
+        "CliRunner().invoke(cli, ['convert', '--help'])\n"
+        "assert len(logging.getLogger().handlers) == 1, logging.getLogger().handlers\n"
+        "assert not logging.getLogger('dot2archimate.cli.commands').handlers\n"
+    )
+    assert result.returncode == 0, result.stderr
@@ -0,0 +1,236 @@
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+
+import pytest
+
+# Add parent directory to path to allow imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dot2archimate.config import yaml_compat
+from dot2archimate.core.mapper import ArchimateMapper
+from dot2archimate.core.model import DotNode
+
+def test_explicit_types_use_first_matching_rule(tmp_path):
+    """Test that explicit node and edge types map through the configured rules."""
+    config_file = tmp_path / "config.yaml"
+    config_file.write_text(
+        "mapping_rules:\n"
+        "  nodes:\n"
+        "    app:\n"
+        "      type: application-component\n"
+        "    application:\n"
+        "      type: application-service\n"
+        "  relationships:\n"
+        "    uses:\n"
+        "      type: serving-relationship\n"
+    )
+    mapper = ArchimateMapper(str(config_file))
+
+    # Rules are flattened once, in config order
+    assert mapper._node_rules == (('app', 'application-component'), ('application', 'application-service'))
+    assert mapper._edge_rules == (('uses', 'serving-relationship'),)
+
+    # 'app' is contained in 'application' and comes first, so it wins
+    assert mapper._determine_node_type('n', {'type': 'Application'}) == 'application-component'
+    assert mapper._determine_node_type('n', {'type': 'custom-type'}) == 'custom-type'
+    assert mapper._determine_relationship_type({'type': 'uses'}, {}, {}) == 'serving-relationship'
+    assert mapper._determine_relationship_type({'label': 'often uses'}, {}, {}) == 'serving-relationship'
+    assert mapper._determine_relationship_type({'type': 'custom'}, {}, {}) == 'custom'
+
+def test_label_keywords_take_precedence_over_rules(tmp_path):
+    """Test that label keywords apply in order before the relationship rules."""
+    config_file = tmp_path / "config.yaml"
+    config_file.write_text(
+        "mapping_rules:\n"
+        "  relationships:\n"
+        "    writes:\n"
+        "      type: access-relationship\n"
+        "    owns:\n"
+        "      type: composition-relationship\n"
+    )
+    mapper = ArchimateMapper(str(config_file))
+
+    # Keyword order decides, not the position in the label
+    assert mapper._determine_relationship_type({'label': 'writes and uses'}, {}, {}) == 'serving-relationship'
+    assert mapper._determine_relationship_type({'label': 'Writes'}, {}, {}) == 'flow-relationship'
+    # Keywords match anywhere in the label, including inflected words
+    assert mapper._determine_relationship_type({'label': 'reads from'}, {}, {}) == 'serving-relationship'
+    assert mapper._determine_relationship_type({'label': 'overwrites'}, {}, {}) == 'flow-relationship'
+    assert mapper._determine_relationship_type({'label': 'owns'}, {}, {}) == 'composition-relationship'
+
+def test_map_to_archimate_returns_records():
+    """Test that mapped elements and relationships reference each other by id."""
+    mapper = ArchimateMapper()
+    graph_data = {
+        'nodes': {
+            'a': {'id': 'a', 'attributes': {'label': 'A', 'tier': '1'}},
+            'b': {'id': 'b', 'attributes': {}}
+        },
+        'edges': [{'source': 'a', 'target': 'b', 'attributes': {'label': 'uses'}}]
+    }
+    result = mapper.map_to_archimate(graph_data)
+
+    a, b = result['elements']
+    assert (a.name, a.type, a.properties) == ('A', 'application-component', {'tier': '1'})
+    relationship, = result['relationships']
+    assert (relationship.source, relationship.target) == (a.id, b.id)
+    assert relationship.type == 'serving-relationship'
+    assert len({a.id, b.id, relationship.id}) == 3
+
+    # Records are slotted, without a per-instance __dict__
+    assert not hasattr(a, '__dict__')
+    assert not hasattr(relationship, '__dict__')
+
+def test_empty_rule_sections(tmp_path):
+    """Test that empty mapping rule sections in the config are treated as no rules."""
+    config_file = tmp_path / "config.yaml"
+    config_file.write_text("mapping_rules:\n  nodes:\n  relationships:\n")
+    mapper = ArchimateMapper(str(config_file))
+
+    assert mapper._determine_node_type('n', {'type': 'Custom'}) == 'custom'
+    assert mapper._determine_relationship_type({'label': 'unknown'}, {}, {}) == 'flow-relationship'
+
+def test_element_ids_are_per_graph():
+    """Test that relationships refer to the elements of their own graph."""
+    mapper = ArchimateMapper()
+    graph_data = {
+        'nodes': {'a': {'id': 'a', 'attributes': {}}, 'b': {'id': 'b', 'attributes': {}}},
+        'edges': [{'source': 'a', 'target': 'b', 'attributes': {}}]
+    }
+
+    # Interleave two mappings of the same graph on one mapper
+    first = mapper.iter_archimate(graph_data)
+    first_elements = list(first['elements'])
+    second = mapper.iter_archimate(graph_data)
+    second_elements = list(second['elements'])
+
+    relationship, = first['relationships']
+    assert (relationship.source, relationship.target) == tuple(e.id for e in first_elements)
+    relationship, = second['relationships']
+    assert (relationship.source, relationship.target) == tuple(e.id for e in second_elements)
+
+def test_config_is_parsed_once_per_file_version(tmp_path):
+    """Test that mappers built from an unchanged config share one parse."""
+    config_file = tmp_path / "config.yaml"
+    config_file.write_text("mapping_rules:\n  nodes:\n    app:\n      type: application-component\n")
+
+    misses = yaml_compat._load_file_cached.cache_info().misses
+    first = ArchimateMapper(str(config_file))
+    second = ArchimateMapper(str(config_file))
+
+    assert yaml_compat._load_file_cached.cache_info().misses == misses + 1
+    # Each mapper still gets its own copy of the rules
+    assert first.mapping_rules == second.mapping_rules
+    assert first.mapping_rules is not second.mapping_rules
+
+def _terraform_node(display_id):
+    """Return a parsed Terraform node for a resource address."""
+    return DotNode(f'[root] {display_id} (expand)', display_id, display_id, {})
+
+def test_cloud_relationships_by_resource_pair():
+    """Test that same-provider resource pairs map through the relationship table."""
+    mapper = ArchimateMapper()
+
+    def relationship(source, target):
+        return mapper._determine_relationship_type({}, _terraform_node(source), _terraform_node(target), True)
+
+    assert relationship('aws_instance.web', 'aws_subnet.a') == 'serving-relationship'
+    assert relationship('azurerm_subnet.a', 'azurerm_virtual_network.v') == 'composition-relationship'
+    assert relationship('google_sql_database_instance.db', 'google_storage_bucket.b') == 'access-relationship'
+    # Known pairs only apply in their own direction and under one provider
+    assert relationship('aws_subnet.a', 'aws_instance.web') == 'flow-relationship'
+    assert relationship('aws_instance.web', 'google_compute_subnetwork.a') == 'flow-relationship'
+    # Ids that aren't strings name no provider
+    web, subnet = _terraform_node('aws_instance.web'), _terraform_node('aws_subnet.a')
+    assert mapper._determine_relationship_type({}, web, replace(subnet, display_id=None), True) == 'flow-relationship'
+
+def test_types_are_interned(tmp_path):
+    """Test that records of the same type share one type string."""
+    config_file = tmp_path / "config.yaml"
+    config_file.write_text("mapping_rules:\n  nodes:\n    app:\n      type: application-component\n")
+    mapper = ArchimateMapper(str(config_file))
+    graph_data = {
+        'nodes': {
+            'a': {'id': 'a', 'attributes': {'type': 'app'}},
+            'b': {'id': 'b', 'attributes': {'shape': 'box'}},
+            'c': {'id': 'c', 'attributes': {'type': 'Custom'}},
+            'd': {'id': 'd', 'attributes': {'type': 'CUSTOM'}}
+        },
+        'edges': [
+            {'source': 'a', 'target': 'b', 'attributes': {'type': 'Custom'}},
+            {'source': 'c', 'target': 'd', 'attributes': {'type': 'custom'}}
+        ]
+    }
+    result = mapper.map_to_archimate(graph_data)
+
+    a, b, c, d = result['elements']
+    assert a.type is b.type
+    assert c.type is d.type
+    first, second = result['relationships']
+    assert first.type is second.type
+
+def test_terraform_node_names_are_cleaned():
+    """Test that Terraform decorations are stripped from element names."""
+    mapper = ArchimateMapper()
+    graph_data = {
+        'is_terraform': True,
+        'nodes': {
+            'a': {'id': 'a', 'attributes': {'label': '[root] aws_instance.web (expand)'}},
+            'b': {'id': 'b', 'attributes': {'label': '[root] provider["registry.terraform.io/hashicorp/aws"].west'}}
+        },
+        'edges': []
+    }
+    a, b = mapper.map_to_archimate(graph_data)['elements']
+
+    assert a.name == 'aws_instance.web'
+    assert b.name == 'Provider: registry.terraform.io/hashicorp/aws.west'
+
+def test_terraform_resource_types_use_one_table():
+    """Test that explicit Terraform mappings override the cloud defaults."""
+    mapper = ArchimateMapper()
+
+    # Explicit mapping, cloud default and unknown resource types
+    assert mapper._determine_node_type('azurerm_sql_database.db', {}, True) == 'technology-artifact'
+    assert mapper._determine_node_type('aws_ebs_volume.data', {}, True) == 'technology-artifact'
+    assert mapper._determine_node_type('aws_unknown.x', {}, True) == 'technology-node'
+    assert mapper._determine_node_type('var.region', {}, True) == 'business-actor'
+
+def test_ids_are_minted_once_per_graph():
+    """Test that a graph's ids come from one batch and differ between graphs."""
+    mapper = ArchimateMapper()
+    graph_data = {
+        'nodes': {'a': {'id': 'a', 'attributes': {}}, 'b': {'id': 'b', 'attributes': {}}},
+        'edges': [{'source': 'a', 'target': 'b', 'attributes': {}}]
+    }
+    first = mapper.map_to_archimate(graph_data)
+    second = mapper.map_to_archimate(graph_data)
+
+    ids = [record.id for record in first['elements'] + first['relationships']]
+    assert len({record_id.rsplit('-', 1)[0] for record_id in ids}) == 1
+    assert len(set(ids)) == 3
+    assert not set(ids) & {record.id for record in second['elements'] + second['relationships']}
+
+def test_mapper_is_shared_across_threads():
+    """Test that concurrent mappings on one mapper keep their ids apart."""
+    mapper = ArchimateMapper()
+    nodes = {f'aws_instance.n{i}': {'id': f'aws_instance.n{i}', 'attributes': {}} for i in range(200)}
+    edges = [{'source': f'aws_instance.n{i}', 'target': f'aws_instance.n{i + 1}', 'attributes': {}} for i in range(199)]
+    graph_data = {'nodes': nodes, 'edges': edges, 'is_terraform': True}
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(mapper.map_to_archimate, [graph_data] * 8))
+
+    for result in results:
+        element_ids = [element.id for element in result['elements']]
+        assert [(r.source, r.target) for r in result['relationships']] == list(zip(element_ids, element_ids[1:]))
+
+def test_terraform_resource_types_are_shared_and_read_only():
+    """Test that mappers share one read-only table of Terraform resource types."""
+    mapper = ArchimateMapper()
+
+    assert mapper.terraform_resource_types is ArchimateMapper().terraform_resource_types
+    assert mapper.terraform_resource_types['aws_lambda_function'] == 'application-function'
+    with pytest.raises(TypeError):
+        mapper.terraform_resource_types['aws_instance'] = 'grouping'
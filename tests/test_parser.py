@@ -72,9 +72,9 @@ def test_parse_file(tmp_path):
     # Check that the edge was parsed correctly
     assert len(result['edges']) == 1
     edge = result['edges'][0]
-    assert edge['source'] == 'app1'
-    assert edge['target'] == 'app2'
-    assert edge['attributes']['label'] == 'reads/writes'
+    assert edge.source == 'app1'
+    assert edge.target == 'app2'
+    assert edge.attributes['label'] == 'reads/writes'
 
 def test_invalid_dot():
     """Test parsing an invalid DOT string."""
@@ -87,4 +87,102 @@ def test_invalid_dot():
     
     # The parser should raise a ValueError for invalid DOT
     with pytest.raises(ValueError):
-        parser.parse_string(invalid_dot) 
\ No newline at end of file
+        parser.parse_string(invalid_dot)
+
+def test_parse_stream():
+    """Test parsing DOT content delivered in byte chunks."""
+    parser = DotParser()
+    data = 'digraph G {\n    app [label="Größe"];\n    app -> db;\n}\n'.encode('utf-8')
+    # Split inside the multi-byte 'ö' to exercise incremental decoding
+    split = data.index('ö'.encode('utf-8')) + 1
+    result = parser.parse_stream([data[:split], data[split:]])
+
+    assert result['nodes']['app'].label == 'Größe'
+    assert len(result['edges']) == 1
+
+def test_parse_stream_invalid_encoding():
+    """Test that undecodable input is rejected."""
+    parser = DotParser()
+    with pytest.raises(ValueError):
+        parser.parse_stream([b'digraph G { a -> b; }\xff'])
+
+def test_edge_attributes_are_not_parsed_as_edges():
+    """Test that an arrow inside an edge's attribute list is not a second edge."""
+    parser = DotParser()
+    result = parser.parse_string('digraph G {\n    a -> "b" [label="x -> y"];\n}\n')
+
+    assert [(e.source, e.target) for e in result['edges']] == [('a', 'b')]
+    assert result['edges'][0].attributes == {'label': 'x -> y'}
+    # Endpoints named inside attribute lists still become nodes
+    assert set(result['nodes']) == {'a', 'b', 'x', 'y'}
+
+def test_parse_results_are_cached_by_content(tmp_path, monkeypatch):
+    """Test that identical DOT content is only parsed once."""
+    calls = []
+    parse_dot_content = DotParser._parse_dot_content
+    monkeypatch.setattr(DotParser, '_parse_dot_content',
+                        lambda self, content: calls.append(content) or parse_dot_content(self, content))
+    dot_file = tmp_path / "test.dot"
+    # Content unique to this test, as the cache is shared by all parsers
+    dot_file.write_text(f'digraph G {{\n    a -> b;\n    "{tmp_path}";\n}}\n')
+
+    first = DotParser().parse_file(str(dot_file))
+    assert DotParser().parse_file(str(dot_file)) == first
+    assert DotParser().parse_string(dot_file.read_text()) == first
+    assert DotParser().parse_stream([dot_file.read_bytes()]) == first
+    assert len(calls) == 1
+
+    dot_file.write_text(f'digraph G {{\n    a -> c;\n    "{tmp_path}";\n}}\n')
+    assert 'c' in DotParser().parse_file(str(dot_file))['nodes']
+    assert len(calls) == 2
+
+def test_cached_results_are_copies():
+    """Test that modifying a parse result doesn't affect later parses of the same input."""
+    parser = DotParser()
+    dot = 'digraph G {\n    app [label="App", tier="web"];\n    app -> db [label="uses"];\n}\n'
+
+    first = parser.parse_string(dot)
+    first['nodes']['app'].attributes['tier'] = 'changed'
+    first['edges'][0].attributes.clear()
+    del first['nodes']['db']
+
+    second = parser.parse_string(dot)
+    assert second['nodes']['app'].attributes['tier'] == 'web'
+    assert second['edges'][0].attributes == {'label': 'uses'}
+    assert set(second['nodes']) == {'app', 'db'}
+
+def test_graphviz_source_is_built_on_demand():
+    """Test that parsing keeps no input on the parser and builds a graphviz.Source only on request."""
+    parser = DotParser()
+    parser.parse_string('digraph G {\n    a -> b;\n}\n')
+    assert vars(parser) == {}
+
+    assert parser.graphviz_source('digraph G {\n    a -> b;\n}\n').source == 'digraph G {\n    a -> b;\n}\n'
+
+def test_standalone_nodes_are_matched_per_line():
+    """Test that node definitions are only recognised on lines of their own."""
+    parser = DotParser()
+    result = parser.parse_string('digraph G {\n    a [label="A"];\n\n    b\n    [label="B"];\n    c -> d;\n}\n')
+
+    assert result['nodes']['a'].label == 'A'
+    # Attributes on the following line don't belong to the node
+    assert result['nodes']['b'].attributes == {}
+    assert set(result['nodes']) == {'a', 'b', 'c', 'd'}
+
+def test_attribute_names_are_interned():
+    """Test that nodes share one string per attribute name."""
+    parser = DotParser()
+    result = parser.parse_string('digraph G {\n    a [shape=box];\n    b [shape=box];\n}\n')
+
+    (a_key,), (b_key,) = (node.attributes for node in result['nodes'].values())
+    assert a_key is b_key
+
+def test_nodes_and_edges_are_slotted_records():
+    """Test that parsed nodes and edges are compact records rather than dicts."""
+    parser = DotParser()
+    result = parser.parse_string('digraph G {\n    a [label="A"];\n    a -> b;\n}\n')
+
+    node, edge = result['nodes']['a'], result['edges'][0]
+    assert (node.id, node.display_id, node.label, node.attributes) == ('a', 'a', 'A', {'label': 'A'})
+    assert (edge.source, edge.target, edge.attributes) == ('a', 'b', {})
+    assert not hasattr(node, '__dict__') and not hasattr(edge, '__dict__')
@@ -0,0 +1,54 @@
+import os
+import sys
+
+import pytest
+import yaml
+
+# Add parent directory to path to allow imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dot2archimate.config import yaml_compat
+from dot2archimate.config.settings import Settings
+
+def test_settings_are_isolated_copies(tmp_path):
+    """Test that instances sharing a config file don't share mutable state."""
+    config_file = tmp_path / "config.yaml"
+    config_file.write_text("archimate:\n  namespace: http://example.com/ns/\n")
+
+    first = Settings(str(config_file))
+    second = Settings(str(config_file))
+
+    assert first.get_archimate_namespace() == 'http://example.com/ns/'
+    first.config['archimate']['namespace'] = 'changed'
+    assert second.get_archimate_namespace() == 'http://example.com/ns/'
+
+def test_settings_reload_after_file_change(tmp_path):
+    """Test that an edited config file is picked up by new instances."""
+    config_file = tmp_path / "config.yaml"
+    config_file.write_text("archimate:\n  namespace: http://example.com/old/\n")
+    assert Settings(str(config_file)).get_archimate_namespace() == 'http://example.com/old/'
+
+    config_file.write_text("archimate:\n  namespace: http://example.com/new/\n")
+    stat = config_file.stat()
+    os.utime(config_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert Settings(str(config_file)).get_archimate_namespace() == 'http://example.com/new/'
+
+def test_default_config_is_shared_and_read_only(tmp_path):
+    """Test that a missing config file falls back to the frozen default."""
+    missing = str(tmp_path / "missing.yaml")
+    settings = Settings(missing)
+
+    assert settings.config is Settings(missing).config
+    assert settings.get_mapping_rules()['nodes']['business']['type'] == 'business-actor'
+    with pytest.raises(TypeError):
+        settings.config['archimate'] = {}
+
+    # Saving the default writes a plain, mutable copy
+    settings.save_config(settings.config)
+    assert Settings(missing).get_mapping_rules()['nodes']['business']['attributes'] == ['label', 'description']
+    settings.config['archimate'] = {}
+
+def test_yaml_uses_libyaml_when_available():
+    """Test that configs are parsed with the C loader if PyYAML was built with libyaml."""
+    assert yaml_compat.SafeLoader is getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+    assert yaml_compat.SafeDumper is getattr(yaml, 'CSafeDumper', yaml.SafeDumper)